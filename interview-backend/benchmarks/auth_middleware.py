@@ -0,0 +1,156 @@
+"""
+Requests/sec through the auth middleware: the previous BaseHTTPMiddleware
+implementation (debug prints, blocking users lookup on every request)
+against the pure ASGI middleware with its user cache.
+
+Runs in-process over httpx's ASGI transport with a small app: an
+authenticated JSON route, a streaming route and a static-style route outside
+/api. The users collection is an in-memory stand-in whose find_one sleeps
+--db-latency-ms to model a MongoDB round trip.
+
+Usage (from interview-backend/):
+    python benchmarks/auth_middleware.py [--requests 2000] [--concurrency 20] [--users 50] [--db-latency-ms 1]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import httpx
+from bson import ObjectId
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from jose import jwt
+from starlette.middleware.base import BaseHTTPMiddleware
+
+import middleware.auth as auth
+
+
+class FakeUsers:
+    def __init__(self, users: dict, latency: float):
+        self.users = users
+        self.latency = latency
+
+    def find_one(self, query):
+        time.sleep(self.latency)
+        user = self.users.get(query["_id"])
+        return dict(user) if user else None
+
+
+class FakeDb:
+    name = "benchmark"
+
+    def __init__(self, users: FakeUsers):
+        self.users = users
+
+
+def legacy_middleware(get_db):
+    """The middleware as it was before the pure ASGI rewrite."""
+    class LegacyAuthMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            request.state.user = None
+
+            auth_header = request.headers.get("Authorization")
+            if auth_header and auth_header.startswith("Bearer "):
+                token = auth_header.split(" ")[1]
+                print(token)
+
+                try:
+                    payload = jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+                    print(payload)
+                    user_id = payload.get("id")
+                    print(user_id)
+
+                    if user_id:
+                        with get_db() as db:
+                            print(db.name)
+                            user = db.users.find_one({"_id": ObjectId(user_id)})
+                            print(user)
+                            if user:
+                                user["_id"] = str(user["_id"])
+                                request.state.user = user
+                except Exception:
+                    pass
+
+            return await call_next(request)
+    return LegacyAuthMiddleware
+
+
+def build_app(middleware_class) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware_class)
+
+    @app.get("/api/me")
+    async def me(request: Request):
+        return {"user": request.state.user["_id"] if request.state.user else None}
+
+    @app.get("/api/stream")
+    async def stream(request: Request):
+        return StreamingResponse((f"{i}\n" for i in range(20)), media_type="text/plain")
+
+    @app.get("/static/app.js")
+    async def static_file():
+        return PlainTextResponse("console.log('ok')")
+
+    return app
+
+
+async def run(app, tokens: list, path: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(total))
+
+        async def worker():
+            for i in counter:
+                response = await client.get(path, headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the auth middleware")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    user_ids = [ObjectId() for _ in range(args.users)]
+    db = FakeDb(FakeUsers({uid: {"_id": uid, "role": "student"} for uid in user_ids}, args.db_latency_ms / 1000))
+
+    @contextlib.contextmanager
+    def get_db():
+        yield db
+
+    auth.get_db = get_db
+    tokens = [jwt.encode({"id": str(uid)}, auth.SECRET_KEY, algorithm=auth.ALGORITHM) for uid in user_ids]
+
+    apps = {
+        "before (BaseHTTPMiddleware, no cache)": build_app(legacy_middleware(get_db)),
+        "after (pure ASGI + user cache)": build_app(auth.AuthMiddleware),
+    }
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.users} users, "
+          f"{args.db_latency_ms} ms per users lookup\n")
+    for path in ("/api/me", "/api/stream", "/static/app.js"):
+        for label, app in apps.items():
+            auth.clear_user_cache()
+            # The legacy middleware prints tokens and users; keep them out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                rps = asyncio.run(run(app, tokens, path, args.requests, args.concurrency))
+            print(f"{path:16} {label:40} {rps:10.0f} req/s")
+        print()
+
+
+if __name__ == "__main__":
+    main()
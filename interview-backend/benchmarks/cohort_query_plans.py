@@ -0,0 +1,67 @@
+"""
+Check that every supported cohort filter / sort combination
+(services/cohort_service.py) is answered from an index.
+
+Runs explain() for each combination against the configured MongoDB (the
+indexes from database.py must exist, i.e. the backend has started at least
+once) and prints the winning plan. Exits with status 1 if any plan contains
+a COLLSCAN.
+
+Usage (from interview-backend/):
+    python benchmarks/cohort_query_plans.py [--company-id ID] [--drive-id ID]
+"""
+import argparse
+import itertools
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import get_db
+from services.cohort_service import SORT_FIELDS, explain_cohort_query
+
+
+def filter_combinations(company_id: str, drive_id: str):
+    now = datetime.utcnow()
+    options = {
+        "company_id": [None, company_id],
+        "provisioning_job_id": [None, drive_id],
+        "interview_type": [None, "technical"],
+        "status": [None, "completed"],
+        "score": [None, (None, 5.0), (7.0, 10.0)],
+        "created": [None, (now - timedelta(days=30), now)],
+    }
+    for values in itertools.product(*options.values()):
+        choice = dict(zip(options, values))
+        filters = {key: choice[key] for key in ("company_id", "provisioning_job_id", "interview_type", "status")}
+        if choice["score"]:
+            filters["min_score"], filters["max_score"] = choice["score"]
+        if choice["created"]:
+            filters["created_from"], filters["created_to"] = choice["created"]
+        yield filters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--company-id", default="example-company")
+    parser.add_argument("--drive-id", default="example-drive")
+    args = parser.parse_args()
+
+    scans = 0
+    with get_db() as db:
+        for filters in filter_combinations(args.company_id, args.drive_id):
+            for sort in SORT_FIELDS:
+                plan = explain_cohort_query(db, filters, sort)
+                collscan = "COLLSCAN" in plan["stages"]
+                scans += collscan
+                shown = {key: value for key, value in filters.items() if value is not None}
+                print(f"{'COLLSCAN' if collscan else 'ok':8} sort={sort:12} index={plan['index']} "
+                      f"stages={'>'.join(plan['stages'])} filters={shown}")
+
+    print(f"\n{scans} collection scan(s)")
+    sys.exit(1 if scans else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Compare per-answer and batch answer evaluation on real interview data.
+
+Usage (from interview-backend/):
+    python benchmarks/evaluation_modes.py [--sessions 5] [--budget 6000]
+
+Reads completed sessions (answers that already have a model_answer) from
+MongoDB, re-scores them with both evaluation paths and reports latency,
+token usage and score agreement. Nothing is written back to the database.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import get_db
+from services import llm_service
+
+
+class UsageCounter:
+    """Wrap the OpenAI client and add up token usage of every completion."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def reset(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def install(self):
+        original = llm_service.get_clientgpt
+        counter = self
+
+        def counting_client():
+            client = original()
+            create = client.chat.completions.create
+
+            def counted_create(*args, **kwargs):
+                response = create(*args, **kwargs)
+                counter.calls += 1
+                if response.usage:
+                    counter.prompt_tokens += response.usage.prompt_tokens
+                    counter.completion_tokens += response.usage.completion_tokens
+                return response
+
+            client.chat.completions.create = counted_create
+            return client
+
+        llm_service.get_clientgpt = counting_client
+
+
+def load_sessions(limit: int) -> list:
+    sessions = []
+    with get_db() as db:
+        cursor = db.interview_sessions.find({"status": "completed"}).sort("completed_at", -1).limit(limit)
+        for session in cursor:
+            q_map = {q["id"]: q.get("text", "") for q in session.get("questions", [])}
+            items = []
+            for ans in db.interview_answers.find({"session_id": session["id"]}):
+                if not ans.get("transcript") or not ans.get("model_answer"):
+                    continue
+                if not q_map.get(ans.get("question_id")):
+                    continue
+                items.append({
+                    "question": q_map[ans["question_id"]],
+                    "transcript": ans["transcript"],
+                    "reference_answer": ans["model_answer"]
+                })
+            if items:
+                sessions.append((session.get("interview_type", "technical"), items))
+    return sessions
+
+
+def run_mode(mode: str, sessions: list, counter: UsageCounter, budget: int):
+    counter.reset()
+    scores = []
+    started = time.perf_counter()
+    for interview_type, items in sessions:
+        if mode == "batch":
+            evaluations = llm_service.evaluate_answers_batch(items, interview_type, token_budget=budget)
+        else:
+            evaluations = [
+                llm_service.evaluate_answer(
+                    item["question"], item["transcript"], item["reference_answer"], interview_type
+                )
+                for item in items
+            ]
+        scores.extend(e.get("total_score") or e.get("score") or 0 for e in evaluations)
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "calls": counter.calls,
+        "prompt_tokens": counter.prompt_tokens,
+        "completion_tokens": counter.completion_tokens,
+        "scores": scores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5, help="number of completed sessions to replay")
+    parser.add_argument("--budget", type=int, default=6000, help="batch token budget")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.sessions)
+    if not sessions:
+        print("No completed sessions with scored answers found.")
+        return
+
+    answer_count = sum(len(items) for _, items in sessions)
+    print(f"Replaying {len(sessions)} session(s), {answer_count} answer(s)\n")
+
+    counter = UsageCounter()
+    counter.install()
+
+    results = {mode: run_mode(mode, sessions, counter, args.budget) for mode in ("per_answer", "batch")}
+
+    print(f"{'mode':<12}{'seconds':>10}{'calls':>8}{'prompt tok':>12}{'compl tok':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<12}{r['seconds']:>10.2f}{r['calls']:>8}{r['prompt_tokens']:>12}{r['completion_tokens']:>12}")
+
+    diffs = [abs(a - b) for a, b in zip(results["per_answer"]["scores"], results["batch"]["scores"])]
+    within_one = sum(1 for d in diffs if d <= 1) / len(diffs)
+    print(f"\nScore agreement: mean |diff| = {sum(diffs) / len(diffs):.2f}, within 1 point = {within_one:.0%}")
+
+
+if __name__ == "__main__":
+    main()
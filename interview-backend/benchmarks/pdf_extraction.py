@@ -0,0 +1,79 @@
+"""
+Compare the PyPDF2 resume extractor that pdf_service used before with the
+current PyMuPDF engine on the sample PDFs in backend-code/uploads.
+
+Usage (from interview-backend/, PyPDF2 must be installed):
+    python benchmarks/pdf_extraction.py [--rounds 5]
+
+Reports per-file and total time for the legacy extractor, the new engine on
+a cold cache and the new engine on a warm (SHA-256 hit) cache.
+"""
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyPDF2 import PdfReader
+from services import pdf_service
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent.parent / "backend-code" / "uploads"
+
+
+def legacy_extract(pdf_bytes: bytes) -> str:
+    reader = PdfReader(BytesIO(pdf_bytes))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() + "\n"
+    return text.strip()
+
+
+def timed(fn, pdf_bytes: bytes, rounds: int):
+    best = float("inf")
+    result = ""
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = fn(pdf_bytes)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def cold_extract(pdf_bytes: bytes) -> str:
+    pdf_service._text_cache.clear()
+    return pdf_service.extract_text_from_pdf(pdf_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="runs per file; the best time is reported")
+    args = parser.parse_args()
+
+    samples = sorted(SAMPLES_DIR.glob("*.pdf"))
+    if not samples:
+        print(f"No sample PDFs found in {SAMPLES_DIR}")
+        return
+
+    print(f"{'file':<36}{'KB':>7}{'legacy ms':>11}{'cold ms':>10}{'warm ms':>10}{'legacy chars':>14}{'new chars':>11}")
+    totals = [0.0, 0.0, 0.0]
+    for path in samples:
+        pdf_bytes = path.read_bytes()
+        legacy_t, legacy_text = timed(legacy_extract, pdf_bytes, args.rounds)
+        cold_t, new_text = timed(cold_extract, pdf_bytes, args.rounds)
+        warm_t, _ = timed(pdf_service.extract_text_from_pdf, pdf_bytes, args.rounds)
+        totals[0] += legacy_t
+        totals[1] += cold_t
+        totals[2] += warm_t
+        print(
+            f"{path.name:<36}{len(pdf_bytes) / 1024:>7.0f}{legacy_t * 1000:>11.1f}{cold_t * 1000:>10.1f}"
+            f"{warm_t * 1000:>10.3f}{len(legacy_text):>14}{len(new_text):>11}"
+        )
+
+    print(f"\n{'total':<43}{totals[0] * 1000:>11.1f}{totals[1] * 1000:>10.1f}{totals[2] * 1000:>10.3f}")
+    if totals[1]:
+        print(f"Cold speedup: {totals[0] / totals[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Time relevance ranking of a company question bank with the in-process
+TF-IDF index (services/question_index.py) on a synthetic bank.
+
+Usage (from interview-backend/):
+    python benchmarks/question_ranking.py [--questions 1000] [--picks 10] [--rounds 50]
+
+Reports the index build time, the first query (vectors computed) and the
+best/median time of later queries.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.question_index import CompanyQuestionIndex
+
+TOPICS = [
+    "python", "java", "react", "node.js", "sql", "mongodb", "kubernetes", "docker", "aws", "rest",
+    "graphql", "caching", "microservices", "kafka", "redis", "testing", "security", "algorithms",
+    "concurrency", "networking", "linux", "git", "typescript", "c++", "spark", "pandas",
+]
+TEMPLATES = [
+    "Explain how you would use {0} together with {1} in a production system.",
+    "What are the trade-offs between {0} and {1}?",
+    "Describe a bug you fixed involving {0} and what you learned about {1}.",
+    "How would you design a scalable service built on {0} and {1}?",
+    "Walk me through debugging slow {0} queries in a {1} application.",
+]
+QUERY = (
+    "Backend engineer: Python, Django, REST APIs, PostgreSQL and Redis caching. "
+    "Experience with Docker, Kubernetes on AWS and Kafka event streaming. "
+    "Built microservices, wrote integration tests, improved query performance."
+)
+
+
+def synthetic_questions(count: int) -> list:
+    rng = random.Random(7)
+    return [
+        {
+            "id": f"q{i}",
+            "question_text": rng.choice(TEMPLATES).format(*rng.sample(TOPICS, 2)),
+            "interview_type": "technical",
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=1000, help="size of the synthetic bank")
+    parser.add_argument("--picks", type=int, default=10, help="questions selected per session")
+    parser.add_argument("--rounds", type=int, default=50, help="ranking queries to time")
+    args = parser.parse_args()
+
+    questions = synthetic_questions(args.questions)
+
+    started = time.perf_counter()
+    index = CompanyQuestionIndex("benchmark")
+    for question in questions:
+        index.add(question)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    top = index.rank(QUERY, args.picks, "technical")
+    first_ms = (time.perf_counter() - started) * 1000
+
+    timings = []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        index.rank(QUERY, args.picks, "technical")
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"bank: {args.questions} questions, {args.picks} picks per session")
+    print(f"index build:       {build_ms:8.2f} ms")
+    print(f"first query:       {first_ms:8.2f} ms (computes vectors)")
+    print(f"later queries:     {min(timings):8.2f} ms best, {statistics.median(timings):.2f} ms median")
+    print("top picks:")
+    for question in top:
+        print(f"  - {question['question_text']}")
+
+
+if __name__ == "__main__":
+    main()
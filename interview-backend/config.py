@@ -13,6 +13,55 @@ class Settings(BaseSettings):
     # Load these values from environment/.env via BaseSettings
     mongodb_uri: Optional[str] = None
     mongodb_db_name: str = "ai_interviewer"
+    # Answer evaluation: "per_answer" (one LLM call per answer) or "batch"
+    evaluation_mode: str = "per_answer"
+    batch_eval_token_budget: int = 6000
+    # Score each answer in the background as soon as it is uploaded
+    incremental_scoring: bool = True
+    scoring_wait_seconds: int = 60
+    # Generate reference answers in the background at session creation
+    precompute_reference_answers: bool = False
+    # Local pre-scoring of empty / filler / "I don't know" answers (no LLM call)
+    prescore_enabled: bool = True
+    prescore_min_tokens: int = 4
+    prescore_short_answer_tokens: int = 15
+    prescore_max_filler_ratio: float = 0.6
+    prescore_max_question_overlap: float = 0.8
+    # Resume PDF text extraction limits and in-process cache size
+    pdf_max_pages: int = 10
+    pdf_max_chars: int = 20000
+    pdf_text_cache_size: int = 256
+    # PDF report rendering processes (0 = render in a thread) and rendered-report cache size
+    pdf_render_workers: int = 2
+    pdf_report_cache_mb: int = 64
+    # Draw general-interview questions from a shared per-JD pool (placement drives)
+    question_pool_enabled: bool = False
+    question_pool_size: int = 40
+    question_pool_resume_questions: int = 0
+    # Serve stored questions when generation takes longer than this (0 = wait indefinitely)
+    question_generation_slo_seconds: float = 0
+    # Keep a degraded session's late-generated questions for the candidate's next attempt at the same interview
+    degraded_session_upgrade: bool = False
+    # Difficulty mix for company questions, e.g. "easy:1,medium:2,hard:1" (empty = bank's own mix)
+    company_question_mix: str = ""
+    # Rank company questions against the JD/resume with the in-process TF-IDF index
+    company_question_ranking: bool = True
+    question_ranking_diversity: float = 0.3
+    question_index_ttl_seconds: int = 300
+    # MinHash near-duplicate detection for bulk-imported and OCR-extracted questions
+    question_dedupe_enabled: bool = True
+    question_dedupe_threshold: float = 0.8
+    # Questions written per insert_many batch by file imports
+    question_import_batch_size: int = 500
+    # How long a worker serves GET /companies from its in-process cache
+    catalog_cache_ttl_seconds: int = 30
+    # How long a worker answers conditional GETs of completed sessions without a database read
+    etag_cache_ttl_seconds: int = 30
+    # Sessions written per insert_many batch by bulk provisioning
+    provisioning_batch_size: int = 100
+    # Users cached per worker by the auth middleware (0 = look up on every request)
+    auth_user_cache_size: int = 10000
+    auth_user_cache_ttl_seconds: int = 60
 
     model_config = ConfigDict(
         env_file=".env",
@@ -40,6 +40,26 @@ def get_mongodb_client():
 
         # Create indexes used by the application
         _db.interview_sessions.create_index("id", unique=True)
+        # Drive leaderboards; only provisioned sessions are indexed (sparse has no
+        # effect on a compound index whose id is always present, so an earlier
+        # sparse version is replaced)
+        drive_index = _db.interview_sessions.index_information().get("provisioning_job_id_1_final_score_-1_id_-1")
+        if drive_index and "partialFilterExpression" not in drive_index:
+            _db.interview_sessions.drop_index("provisioning_job_id_1_final_score_-1_id_-1")
+        _db.interview_sessions.create_index(
+            [("provisioning_job_id", 1), ("final_score", -1), ("id", -1)],
+            partialFilterExpression={"provisioning_job_id": {"$exists": True}}
+        )
+        _db.interview_sessions.create_index([("user_id", 1), ("company_id", 1)])
+        _db.interview_sessions.create_index([("user_id", 1), ("created_at", -1), ("id", -1)])
+        # Cohort queries (services/cohort_service.py): equality, then sort/range field, then id
+        _db.interview_sessions.create_index([("company_id", 1), ("created_at", -1), ("id", -1)])
+        _db.interview_sessions.create_index([("company_id", 1), ("final_score", 1), ("id", 1)])
+        _db.interview_sessions.create_index([("status", 1), ("created_at", -1), ("id", -1)])
+        _db.interview_sessions.create_index([("status", 1), ("final_score", 1), ("id", 1)])
+        _db.interview_sessions.create_index([("created_at", -1), ("id", -1)])
+        _db.interview_sessions.create_index([("final_score", 1), ("id", 1)])
+        _db.interview_sessions.create_index([("completed_at", -1), ("id", -1)])
         _db.interview_answers.create_index("id", unique=True)
         _db.interview_answers.create_index([("session_id", 1), ("question_id", 1)])
         
@@ -47,7 +67,35 @@ def get_mongodb_client():
         _db.companies.create_index("id", unique=True)
         _db.companies.create_index("name", unique=True)
         _db.company_questions.create_index("id", unique=True)
-        _db.company_questions.create_index([("company_id", 1), ("interview_type", 1)])
+        _db.company_questions.create_index([("company_id", 1), ("interview_type", 1), ("difficulty", 1)])
+        # Exact repeats are rejected; questions stored before content_hash existed are exempt
+        _db.company_questions.create_index(
+            [("company_id", 1), ("content_hash", 1)],
+            unique=True,
+            partialFilterExpression={"content_hash": {"$exists": True}}
+        )
+        _db.question_imports.create_index("id", unique=True)
+        # Question bank search: relevance-ranked text search and newest-first browsing
+        _db.company_questions.create_index([("question_text", "text")], name="question_text_search")
+        _db.company_questions.create_index([("created_at", -1), ("id", -1)])
+        _db.company_questions.create_index([("company_id", 1), ("created_at", -1), ("id", -1)])
+
+        # Resume profiles, one per user and unique resume
+        _db.resume_profiles.create_index([("user_id", 1), ("content_hash", 1)], unique=True)
+        _db.resume_profiles.create_index("id", unique=True)
+
+        # Shared question pools, one per job description and interview type
+        _db.question_pools.create_index([("jd_hash", 1), ("interview_type", 1)], unique=True)
+
+        # Bulk session provisioning jobs
+        _db.provisioning_jobs.create_index("id", unique=True)
+        _db.score_rollups.create_index([("scope", 1), ("key", 1), ("interview_type", 1)], unique=True)
+
+        # LLM / transcription usage ledger
+        _db.llm_usage.create_index("session_id")
+        _db.llm_usage.create_index("upload_id")
+        _db.llm_usage.create_index([("company_id", 1), ("created_at", 1)])
+        _db.llm_usage.create_index("created_at")
 
         # Perform a lightweight ping to verify connection and give a clear startup message
         logger = logging.getLogger("backend.database")
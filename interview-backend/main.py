@@ -11,10 +11,11 @@ if str(project_root) not in sys.path:
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from routes import session, upload, analyze, ocr, companies
+from routes import session, upload, analyze, ocr, companies, usage, question_pools, provisioning, question_search, cohorts, rollups, auth
 from database import get_mongodb_client
 from config import get_ocr_config
 from middleware.auth import AuthMiddleware
+from services.report_service import shutdown_render_pool
 
 app = FastAPI(title="AI Interviewer API")
 
@@ -32,6 +33,13 @@ app.include_router(upload.router, prefix="/api")
 app.include_router(analyze.router, prefix="/api")
 app.include_router(ocr.router, prefix="/api")  # OCR Service routes
 app.include_router(companies.router, prefix="/api")  # Company management routes
+app.include_router(usage.router, prefix="/api")  # LLM usage ledger routes
+app.include_router(question_pools.router, prefix="/api")  # Shared JD question pools
+app.include_router(provisioning.router, prefix="/api")  # Bulk session provisioning for drives
+app.include_router(question_search.router, prefix="/api")  # Question bank search
+app.include_router(cohorts.router, prefix="/api")  # Mentor/admin cohort queries
+app.include_router(rollups.router, prefix="/api")  # Score rollups per user, company and drive
+app.include_router(auth.router, prefix="/api")  # Auth user cache invalidation
 
 
 # Use absolute paths
@@ -75,3 +83,8 @@ async def startup_event():
     except Exception as e:
         logger.error(f"MongoDB connection failed: {e}")
         logger.warning("Application will continue but database features may not work")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_render_pool()
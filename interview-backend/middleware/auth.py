@@ -1,38 +1,137 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
 from jose import jwt
-from database import get_db
 from bson import ObjectId
+from config import get_settings
+from database import get_db
 
 
 import os
 SECRET_KEY = os.getenv("JWT_SECRET")
 ALGORITHM = "HS256"
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request.state.user = None
-
-        auth = request.headers.get("Authorization")
-        if auth and auth.startswith("Bearer "):
-            token = auth.split(" ")[1]
-            print(token)
-
-            try:
-                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-                print(payload)
-                user_id = payload.get("id") 
-                print(user_id) # 👈 MATCH NODE
-
-                if user_id:
-                    with get_db() as db:
-                        print(db.name)
-                        user = db.users.find_one({"_id": ObjectId(user_id)})
-                        print(user)
-                        if user:
-                            user["_id"] = str(user["_id"])
-                            request.state.user = user
-            except Exception:
-                pass
-
-        return await call_next(request)
+logger = logging.getLogger("backend.auth")
+
+# Only API routes need the user; static files and the frontend skip the lookup
+AUTH_PATH_PREFIX = "/api/"
+
+
+class UserCache:
+    """
+    Bounded LRU cache of user documents keyed by user id, each entry expiring
+    after ttl seconds. Unknown ids are cached too (as None) so a stale token
+    cannot force a database read on every request.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user id -> (expires_at, user or None)
+
+    def get(self, user_id: str):
+        """Return (hit, user)."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return False, None
+            self._entries.move_to_end(user_id)
+            return True, entry[1]
+
+    def put(self, user_id: str, user):
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_settings = get_settings()
+user_cache = UserCache(_settings.auth_user_cache_size, _settings.auth_user_cache_ttl_seconds)
+
+
+def invalidate_user(user_id: str):
+    """Drop a user from this worker's cache, e.g. after a role change or deletion."""
+    user_cache.invalidate(user_id)
+
+
+def clear_user_cache():
+    user_cache.clear()
+
+
+def _load_user(user_id: str):
+    with get_db() as db:
+        user = db.users.find_one({"_id": ObjectId(user_id)})
+    if user:
+        user["_id"] = str(user["_id"])
+    return user
+
+
+def _bearer_token(scope) -> str:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            value = value.decode("latin-1")
+            return value[7:] if value.startswith("Bearer ") else None
+    return None
+
+
+async def authenticate(scope):
+    """User document for the request's bearer token, or None."""
+    token = _bearer_token(scope)
+    if not token:
+        return None
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = payload.get("id")  # 👈 MATCH NODE
+        if not user_id:
+            return None
+
+        hit, user = user_cache.get(user_id)
+        if not hit:
+            # pymongo is blocking; keep it off the event loop
+            user = await asyncio.to_thread(_load_user, user_id)
+            user_cache.put(user_id, user)
+    except Exception as e:
+        logger.debug(f"Rejected bearer token: {e}")
+        return None
+
+    # Routes get their own copy so a handler cannot alter the cached document
+    return dict(user) if user else None
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware setting request.state.user from the bearer token.
+
+    Unlike BaseHTTPMiddleware it does not wrap the response, so streaming
+    responses pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            state = scope.setdefault("state", {})
+            state["user"] = None
+            if scope["path"].startswith(AUTH_PATH_PREFIX):
+                state["user"] = await authenticate(scope)
+
+        await self.app(scope, receive, send)
@@ -1,9 +1,17 @@
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 from database import get_db
-from services.llm_service import evaluate_answer, generate_reference_answer
-from services.export_service import generate_pdf_report
+from config import get_settings
+from services.llm_service import evaluate_answer, evaluate_answers_batch
+from services.report_service import load_report_data, render_report
+from services.scoring_service import category_scores, get_reference_answer, prescored_fields, wait_for_pending_scores, ANALYZING, DONE
+from services.score_rollups import record_session_rollup
+from services.versioning import forget_session, is_not_modified, not_modified_response, session_validators, stamp, strong_etag, validator_headers
+from services.prescore_service import prescore_answer, prescore_stats
+from services.usage_ledger import usage_scope, session_usage
+from routes.companies import is_admin
 from datetime import datetime
+import asyncio
 import time
 
 router = APIRouter()
@@ -13,9 +21,19 @@ async def analyze_session(session_id: str, request: Request):
     user_id = request.state.user["_id"]
     retries = 0
 
+    # Answers are scored in the background as they are uploaded; give the
+    # stragglers a chance to finish before scoring the rest inline.
+    settings = get_settings()
+    if settings.incremental_scoring:
+        # Only the owner may hold the request open on a session's scoring
+        with get_db() as db:
+            if not db.interview_sessions.find_one({"id": session_id, "user_id": user_id}, {"_id": 1}):
+                raise HTTPException(status_code=404, detail="Session not found")
+        await wait_for_pending_scores(session_id, settings.scoring_wait_seconds)
+
     while retries < 3:
         try:
-            with get_db() as db:
+            with get_db() as db, usage_scope(session_id=session_id) as usage_links:
                 session = db.interview_sessions.find_one({
                     "id": session_id,
                     "user_id": user_id
@@ -24,17 +42,17 @@ async def analyze_session(session_id: str, request: Request):
                 if not session:
                     raise HTTPException(status_code=404, detail="Session not found")
 
+                if session.get("company_id"):
+                    usage_links["company_id"] = session["company_id"]
+
                 questions = session.get("questions", [])
                 interview_type = session.get("interview_type", "technical")
-                jd_text = session.get("job_description", "")
-                resume_text = session.get("resume_text", "")
 
                 answers = list(db.interview_answers.find({"session_id": session_id}))
                 q_map = {q["id"]: q.get("text", "") for q in questions}
 
-                total_score = 0
-                scored_count = 0
                 reference_cache = {}
+                pending = []
 
                 for ans in answers:
                     if ans.get("score") is not None or not ans.get("transcript"):
@@ -45,48 +63,94 @@ async def analyze_session(session_id: str, request: Request):
                     if not question_text:
                         continue
 
-                    if qid not in reference_cache:
-                        reference_cache[qid] = generate_reference_answer(
-                            question_text,
-                            jd_text,
-                            resume_text,
-                            interview_type
+                    # Claim the answer so a background score_answer still in
+                    # flight (the wait timed out) cannot overwrite this result;
+                    # if the claim fails, that scoring finished first
+                    claimed = db.interview_answers.update_one(
+                        {
+                            "id": ans["id"],
+                            "transcript": ans["transcript"],
+                            "score": None,
+                            "scoring_status": ans.get("scoring_status")
+                        },
+                        stamp({"$set": {"scoring_status": ANALYZING}})
+                    )
+                    if not claimed.matched_count:
+                        continue
+
+                    # Low-content answers are scored locally without any LLM call
+                    prescored = prescore_answer(question_text, ans["transcript"])
+                    if prescored:
+                        db.interview_answers.update_one(
+                            {"id": ans["id"], "scoring_status": ANALYZING},
+                            stamp({"$set": prescored_fields(session, qid, prescored)})
                         )
+                        continue
 
-                    evaluation = evaluate_answer(
-                        question_text,
-                        ans["transcript"],
-                        reference_cache[qid],
-                        interview_type
-                    )
+                    if qid not in reference_cache:
+                        reference_cache[qid] = await asyncio.to_thread(get_reference_answer, session, qid, question_text)
+
+                    pending.append({
+                        "answer": ans,
+                        "question": question_text,
+                        "transcript": ans["transcript"],
+                        "reference_answer": reference_cache[qid]
+                    })
+
+                # LLM calls (and their retry backoff) run off the event loop
+                if settings.evaluation_mode == "batch" and pending:
+                    evaluations = await asyncio.to_thread(evaluate_answers_batch, pending, interview_type)
+                else:
+                    evaluations = []
+                    for item in pending:
+                        evaluations.append(await asyncio.to_thread(
+                            evaluate_answer,
+                            item["question"],
+                            item["transcript"],
+                            item["reference_answer"],
+                            interview_type
+                        ))
 
+                for item, evaluation in zip(pending, evaluations):
                     score = evaluation.get("total_score") or evaluation.get("score") or 0
                     feedback = evaluation.get("feedback", [])
 
-                    total_score += score
-                    scored_count += 1
-
                     db.interview_answers.update_one(
-                        {"id": ans["id"]},
-                        {"$set": {
+                        {"id": item["answer"]["id"], "scoring_status": ANALYZING},
+                        stamp({"$set": {
                             "score": score,
+                            "category_scores": category_scores(evaluation),
                             "feedback": feedback,
-                            "model_answer": reference_cache[qid]
-                        }}
+                            "model_answer": item["reference_answer"],
+                            "scoring_status": DONE
+                        }})
                     )
 
+                scored_answers = list(db.interview_answers.find(
+                    {"session_id": session_id, "score": {"$ne": None}},
+                    {"score": 1, "category_scores": 1}
+                ))
+                scores = [a["score"] for a in scored_answers]
+                total_score = sum(scores)
+                scored_count = len(scores)
+
                 final_score = round(
                     total_score / scored_count, 2
                 ) if scored_count > 0 else 0
 
+                # Also covers the answer updates above
                 db.interview_sessions.update_one(
                     {"id": session_id},
-                    {"$set": {
+                    stamp({"$set": {
                         "status": "completed",
                         "final_score": final_score,
-                        "completed_at": datetime.utcnow()
-                    }}
+                        "completed_at": datetime.utcnow(),
+                        "usage": session_usage(session_id)["totals"]
+                    }})
                 )
+                forget_session(session_id)
+
+                record_session_rollup(db, session_id, final_score, scored_answers)
 
             return {
                 "status": "success",
@@ -100,32 +164,44 @@ async def analyze_session(session_id: str, request: Request):
                 raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/prescore-stats")
+async def get_prescore_stats(request: Request):
+    """Answers scored locally by the pre-scorer and LLM calls saved since startup (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return prescore_stats()
+
+
 @router.get("/export-pdf/{session_id}")
 async def export_pdf(session_id: str, request: Request):
     user_id = request.state.user["_id"]
 
-    with get_db() as db:
-        session = db.interview_sessions.find_one({
-            "id": session_id,
-            "user_id": user_id
-        })
+    validators = session_validators(session_id, user_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    # The session's version covers its answers, so it identifies the report too
+    etag = strong_etag("pdf", session_id, validators[0])
+    if is_not_modified(request, etag, validators[1]):
+        return not_modified_response(etag, validators[1])
 
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-
-        session.pop("_id", None)
+    with get_db() as db:
+        session, answers = load_report_data(db, session_id, user_id)
 
-        answers = list(db.interview_answers.find({"session_id": session_id}))
-        for a in answers:
-            a.pop("_id", None)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
 
-    pdf_bytes = generate_pdf_report(session, answers)
+    pdf_bytes, _ = await render_report(session, answers)
 
-    return StreamingResponse(
-        iter([pdf_bytes]),
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={
             "Content-Disposition":
-            f"attachment; filename=interview_{session_id[:8]}.pdf"
+            f"attachment; filename=interview_{session_id[:8]}.pdf",
+            **validator_headers(etag, validators[1])
         }
     )
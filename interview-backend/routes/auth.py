@@ -0,0 +1,29 @@
+from typing import Optional
+from fastapi import APIRouter, Form, HTTPException, Request
+from routes.companies import is_admin
+from middleware.auth import clear_user_cache, invalidate_user
+
+router = APIRouter()
+
+@router.post("/auth/invalidate-user")
+async def invalidate_cached_user(request: Request, user_id: Optional[str] = Form(None)):
+    """
+    Drop a user (or, without user_id, every user) from the auth cache after a
+    role change or deletion in the main backend (Admin only). Only this worker
+    is cleared; others pick the change up within AUTH_USER_CACHE_TTL_SECONDS.
+    """
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if user_id:
+        invalidate_user(user_id)
+    else:
+        clear_user_cache()
+
+    return {
+        "success": True,
+        "message": "User cache cleared"
+    }
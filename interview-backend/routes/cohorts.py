@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
+from services.cohort_service import COHORT_FIELDS, query_cohort
+from services.pagination import parse_fields
+from services.report_service import MAX_EXPORT_SESSIONS, stream_reports_zip
+from services.results_export import stream_results_csv, stream_results_xlsx
+
+router = APIRouter()
+
+def is_staff(user: dict) -> bool:
+    """Check if user is a mentor or admin"""
+    return user and user.get("role") in ["mentor", "admin"]
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def cohort_filters(
+    company_id: Optional[str] = None,
+    drive_id: Optional[str] = None,  # bulk provisioning job id
+    interview_type: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[float] = Query(None, ge=0, le=10),
+    max_score: Optional[float] = Query(None, ge=0, le=10),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> dict:
+    """Cohort filter query parameters, shared by the cohort endpoints"""
+    if interview_type and interview_type not in ["technical", "hr"]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
+    if min_score is not None and max_score is not None and min_score > max_score:
+        raise HTTPException(status_code=400, detail="min_score must not be greater than max_score")
+
+    return {
+        "company_id": company_id,
+        "provisioning_job_id": drive_id,
+        "interview_type": interview_type,
+        "status": status,
+        "min_score": min_score,
+        "max_score": max_score,
+        "created_from": _naive_utc(created_from),
+        "created_to": _naive_utc(created_to)
+    }
+
+@router.get("/cohorts/sessions")
+async def get_cohort_sessions(
+    request: Request,
+    filters: dict = Depends(cohort_filters),
+    sort: str = "created_at",
+    order: str = "desc",
+    fields: Optional[str] = None,  # comma-separated subset of COHORT_FIELDS
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
+):
+    """Sessions across all students matching the filters, keyset-paginated (Mentor/Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_staff(request.state.user):
+        raise HTTPException(status_code=403, detail="Mentor or admin access required")
+
+    if order not in ["asc", "desc"]:
+        raise HTTPException(status_code=400, detail="Invalid order. Must be 'asc' or 'desc'")
+
+    try:
+        projection = parse_fields(fields, COHORT_FIELDS)
+        result = query_cohort(
+            filters,
+            projection=projection,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "success": True,
+        **result
+    }
+
+@router.get("/cohorts/export-pdf")
+async def export_cohort_reports(request: Request, filters: dict = Depends(cohort_filters)):
+    """Zip of the PDF reports of every completed session matching the filters (Mentor/Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_staff(request.state.user):
+        raise HTTPException(status_code=403, detail="Mentor or admin access required")
+
+    filters = {**filters, "status": "completed"}
+    result = query_cohort(filters, projection={"_id": 0, "id": 1, "user_id": 1}, limit=MAX_EXPORT_SESSIONS)
+    if result["next_cursor"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"More than {MAX_EXPORT_SESSIONS} sessions match; narrow the filters"
+        )
+    if not result["sessions"]:
+        raise HTTPException(status_code=404, detail="No completed sessions match the filters")
+
+    entries = [
+        {
+            "session_id": s["id"],
+            "filename": f"{(s.get('student_email') or s['user_id']).replace('/', '_')}_{s['id'][:8]}.pdf"
+        }
+        for s in result["sessions"]
+    ]
+
+    return StreamingResponse(
+        stream_reports_zip(entries),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition":
+            f"attachment; filename=interview_reports_{datetime.utcnow().strftime('%Y%m%d')}.zip"
+        }
+    )
+
+@router.get("/cohorts/export-results")
+async def export_cohort_results(request: Request, format: str = "csv", filters: dict = Depends(cohort_filters)):
+    """Per-question scores, feedback and final scores of matching sessions as CSV or XLSX (Mentor/Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_staff(request.state.user):
+        raise HTTPException(status_code=403, detail="Mentor or admin access required")
+
+    if format not in ["csv", "xlsx"]:
+        raise HTTPException(status_code=400, detail="Invalid format. Must be 'csv' or 'xlsx'")
+
+    if format == "csv":
+        body, media_type = stream_results_csv(filters), "text/csv"
+    else:
+        body, media_type = stream_results_xlsx(filters), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition":
+            f"attachment; filename=interview_results_{datetime.utcnow().strftime('%Y%m%d')}.{format}"
+        }
+    )
@@ -1,6 +1,18 @@
-from fastapi import APIRouter, HTTPException, Request, Form
+from fastapi import APIRouter, HTTPException, Request, Response, Form, UploadFile, File, BackgroundTasks
 from database import get_db
+from services.question_index import index_question_added, index_question_removed, drop_company_index
+from services.question_dedupe import (
+    minhash, get_dedupe_index, dedupe_question_added, dedupe_question_removed, drop_dedupe_index
+)
+from services.question_import_service import question_content_hash, run_question_import
+from services.question_bank_service import DIFFICULTY_ORDER
+from services.company_catalog import get_catalog, invalidate_catalog, bump_question_counts
+from services.versioning import is_not_modified, new_version, not_modified_response, strong_etag, validator_headers
+from config import get_settings
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+import os
+import tempfile
 import uuid
 from datetime import datetime
 from typing import List, Optional
@@ -33,12 +45,17 @@ async def create_company(request: Request, name: str = Form(...), description: O
             "id": company_id,
             "name": name.strip(),
             "description": description.strip() if description else "",
+            "question_count": 0,
+            "question_counts": {},
             "created_by": user_id,
             "created_at": datetime.utcnow()
         }
+        company.update(new_version(company["created_at"]))
         
         db.companies.insert_one(company)
         company.pop("_id", None)
+
+    invalidate_catalog()
     
     return {
         "success": True,
@@ -46,30 +63,47 @@ async def create_company(request: Request, name: str = Form(...), description: O
     }
 
 @router.get("/companies")
-async def get_companies(request: Request):
+async def get_companies(request: Request, response: Response):
     """Get all companies (Available to all authenticated users)"""
     if not request.state.user:
         raise HTTPException(status_code=401, detail="Unauthorized")
     
-    with get_db() as db:
-        companies = list(db.companies.find().sort("name", 1))
-        for company in companies:
-            company.pop("_id", None)
-            # Get question count for each company
-            question_count = db.company_questions.count_documents({"company_id": company["id"]})
-            company["question_count"] = question_count
+    # Cached catalog with maintained question counters; no per-company count queries
+    companies, etag, last_modified = get_catalog()
+
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(validator_headers(etag, last_modified))
     
     return {
         "success": True,
         "companies": companies
     }
 
+def _company_validators(company_id: str, company: dict) -> tuple:
+    """(ETag, Last-Modified) of a company document and its questions."""
+    etag = strong_etag("company", company_id, company.get("version", 0), company.get("question_count", 0))
+    return etag, company.get("updated_at") or company.get("created_at")
+
 @router.get("/companies/{company_id}")
-async def get_company(company_id: str, request: Request):
+async def get_company(company_id: str, request: Request, response: Response):
     """Get company details with questions"""
     if not request.state.user:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    
+
+    # Every question change bumps the company's version, so a conditional
+    # request is answered from a small projected read of the company
+    with get_db() as db:
+        company = db.companies.find_one(
+            {"id": company_id},
+            {"_id": 0, "version": 1, "question_count": 1, "updated_at": 1, "created_at": 1}
+        )
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    validators = _company_validators(company_id, company)
+    if is_not_modified(request, *validators):
+        return not_modified_response(*validators)
+
     with get_db() as db:
         company = db.companies.find_one({"id": company_id})
         if not company:
@@ -78,11 +112,16 @@ async def get_company(company_id: str, request: Request):
         company.pop("_id", None)
         
         # Get questions for this company
-        questions = list(db.company_questions.find({"company_id": company_id}))
+        questions = list(db.company_questions.find({"company_id": company_id}, {"minhash": 0, "content_hash": 0}))
         for q in questions:
             q.pop("_id", None)
         
         company["questions"] = questions
+
+    # From the document actually returned, in case it changed since the check.
+    # The company is read before its questions, so a concurrent change can only
+    # pair a newer body with an older ETag, which the next request refetches.
+    response.headers.update(validator_headers(*_company_validators(company_id, company)))
     
     return {
         "success": True,
@@ -122,12 +161,22 @@ async def add_company_question(
             "question_text": question_text.strip(),
             "interview_type": interview_type,
             "difficulty": difficulty.strip() if difficulty else "medium",
+            "content_hash": question_content_hash(company_id, interview_type, question_text),
+            "minhash": minhash(question_text),
             "created_by": user_id,
             "created_at": datetime.utcnow()
         }
         
-        db.company_questions.insert_one(question)
+        try:
+            db.company_questions.insert_one(question)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail="This question already exists for the company")
         question.pop("_id", None)
+        bump_question_counts(db, company_id, {interview_type: 1})
+
+    index_question_added(question)
+    dedupe_question_added(question)
+    question.pop("minhash", None)
     
     return {
         "success": True,
@@ -139,9 +188,16 @@ async def add_company_questions_bulk(
     request: Request,
     company_id: str,
     questions: str = Form(...),  # JSON string of questions array
-    interview_type: str = Form("technical")
+    interview_type: str = Form("technical"),
+    skip_duplicates: bool = Form(True)
 ):
-    """Add multiple questions to a company at once (Admin only)"""
+    """
+    Add multiple questions to a company at once (Admin only).
+
+    Questions that near-duplicate one already in the company's bank (or
+    earlier in the same request) at QUESTION_DEDUPE_THRESHOLD similarity are
+    skipped and reported, unless skip_duplicates is false.
+    """
     if not request.state.user:
         raise HTTPException(status_code=401, detail="Unauthorized")
     
@@ -169,10 +225,23 @@ async def add_company_questions_bulk(
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
         
+        settings = get_settings()
+        check_duplicates = skip_duplicates and settings.question_dedupe_enabled
+        if check_duplicates:
+            dedupe_index = get_dedupe_index(db, company_id, interview_type)
+        
         inserted_questions = []
+        skipped_duplicates = []
         for q_text in questions_list:
             if not isinstance(q_text, str) or not q_text.strip():
                 continue
+
+            signature = minhash(q_text)
+            if check_duplicates:
+                duplicate_of = dedupe_index.find_duplicate(signature, settings.question_dedupe_threshold)
+                if duplicate_of:
+                    skipped_duplicates.append({"question_text": q_text.strip(), "duplicate_of": duplicate_of})
+                    continue
             
             question_id = str(uuid.uuid4())
             question = {
@@ -181,18 +250,149 @@ async def add_company_questions_bulk(
                 "question_text": q_text.strip(),
                 "interview_type": interview_type,
                 "difficulty": "medium",
+                "content_hash": question_content_hash(company_id, interview_type, q_text),
+                "minhash": signature,
                 "created_by": user_id,
                 "created_at": datetime.utcnow()
             }
             
-            db.company_questions.insert_one(question)
+            try:
+                db.company_questions.insert_one(question)
+            except DuplicateKeyError:
+                # Exact repeat of a stored question
+                existing = db.company_questions.find_one(
+                    {"company_id": company_id, "content_hash": question["content_hash"]},
+                    {"_id": 0, "id": 1, "question_text": 1}
+                )
+                skipped_duplicates.append({
+                    "question_text": q_text.strip(),
+                    "duplicate_of": {**(existing or {}), "similarity": 1.0}
+                })
+                continue
             question.pop("_id", None)
+            index_question_added(question)
+            # Later questions of this request are checked against this one too
+            dedupe_question_added(question)
+            question.pop("minhash", None)
             inserted_questions.append(question)
+
+        bump_question_counts(db, company_id, {interview_type: len(inserted_questions)})
     
     return {
         "success": True,
         "count": len(inserted_questions),
-        "questions": inserted_questions
+        "questions": inserted_questions,
+        "duplicate_count": len(skipped_duplicates),
+        "skipped_duplicates": skipped_duplicates
+    }
+
+@router.post("/companies/{company_id}/questions/import")
+async def import_company_questions(
+    request: Request,
+    company_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),  # NDJSON (one question per line) or CSV with a question_text column
+    interview_type: str = Form("technical"),
+    difficulty: str = Form("medium"),
+    skip_near_duplicates: bool = Form(False)
+):
+    """
+    Import a large NDJSON / CSV question file in the background (Admin only).
+
+    Rows may set their own interview_type and difficulty; the form values are
+    defaults. Exact repeats are skipped, and with skip_near_duplicates
+    reworded repeats too. Poll GET /companies/{id}/questions/import/{job_id}
+    for progress and row errors.
+    """
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    if interview_type not in ["technical", "hr"]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
+    difficulty = difficulty.strip().lower() or "medium"
+    if difficulty not in DIFFICULTY_ORDER:
+        raise HTTPException(status_code=400, detail="Invalid difficulty. Must be 'easy', 'medium' or 'hard'")
+
+    filename = (file.filename or "").lower()
+    if filename.endswith(".csv") or "csv" in (file.content_type or ""):
+        file_format = "csv"
+    elif filename.endswith((".ndjson", ".jsonl")) or "ndjson" in (file.content_type or ""):
+        file_format = "ndjson"
+    else:
+        raise HTTPException(status_code=400, detail="Upload a .ndjson / .jsonl or .csv file")
+
+    with get_db() as db:
+        company = db.companies.find_one({"id": company_id})
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+
+    # Spool the upload to disk in chunks; the background job streams it from there
+    fd, path = tempfile.mkstemp(prefix="question_import_", suffix=f".{file_format}")
+    size = 0
+    with os.fdopen(fd, "wb") as out:
+        while chunk := await file.read(1024 * 1024):
+            out.write(chunk)
+            size += len(chunk)
+
+    if size == 0:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail="Empty file provided")
+
+    job = {
+        "id": str(uuid.uuid4()),
+        "company_id": company_id,
+        "created_by": request.state.user["_id"],
+        "filename": file.filename,
+        "format": file_format,
+        "size_bytes": size,
+        "interview_type": interview_type,
+        "difficulty": difficulty,
+        "skip_near_duplicates": skip_near_duplicates,
+        "status": "queued",
+        "processed": 0,
+        "inserted": 0,
+        "duplicates": 0,
+        "near_duplicates": 0,
+        "invalid": 0,
+        "failed": 0,
+        "errors": [],
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None
+    }
+    with get_db() as db:
+        db.question_imports.insert_one(job)
+        job.pop("_id", None)
+
+    background_tasks.add_task(run_question_import, job["id"], path)
+
+    return {
+        "success": True,
+        "job": job
+    }
+
+@router.get("/companies/{company_id}/questions/import/{job_id}")
+async def get_question_import(company_id: str, job_id: str, request: Request):
+    """Progress and row errors of a question import (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    with get_db() as db:
+        job = db.question_imports.find_one({"id": job_id, "company_id": company_id}, {"_id": 0})
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    return {
+        "success": True,
+        "job": job
     }
 
 @router.delete("/companies/{company_id}")
@@ -214,6 +414,10 @@ async def delete_company(company_id: str, request: Request):
         
         # Delete the company
         db.companies.delete_one({"id": company_id})
+
+    drop_company_index(company_id)
+    drop_dedupe_index(company_id)
+    invalidate_catalog()
     
     return {
         "success": True,
@@ -238,7 +442,12 @@ async def delete_company_question(company_id: str, question_id: str, request: Re
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
         
-        db.company_questions.delete_one({"id": question_id})
+        result = db.company_questions.delete_one({"id": question_id})
+        if result.deleted_count:
+            bump_question_counts(db, company_id, {question.get("interview_type", "technical"): -1})
+
+    index_question_removed(company_id, question_id)
+    dedupe_question_removed(company_id, question.get("interview_type", "technical"), question_id)
     
     return {
         "success": True,
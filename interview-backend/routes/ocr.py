@@ -1,9 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
 import os
+import uuid
 import logging
-from config import get_ocr_config
+from typing import Optional
+from config import get_ocr_config, get_settings
+from database import get_db
 from services.ocr_processor import OCRProcessor
+from services.usage_ledger import usage_scope
+from services.question_dedupe import minhash, get_dedupe_index
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -25,13 +30,21 @@ def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 @router.post("/parse-document")
-async def parse_document(file: UploadFile = File(...)):
+async def parse_document(
+    file: UploadFile = File(...),
+    company_id: Optional[str] = Form(None),
+    interview_type: Optional[str] = Form(None)
+):
     """
     Parse document and extract MCQ questions using GPT-4o-mini Vision API.
     Accepts PDF, JPG, JPEG, PNG files.
     
     For PDFs with multiple pages, the document is automatically split into chunks
     and processed page by page to ensure accurate extraction.
+
+    Near-duplicate questions within the document are dropped. With company_id,
+    questions that near-duplicate one in that company's bank are marked with
+    "duplicate_of"; interview_type limits the check to that type's questions.
     """
     try:
         if not ocr_processor:
@@ -44,6 +57,9 @@ async def parse_document(file: UploadFile = File(...)):
                 }
             )
 
+        if interview_type is not None and interview_type not in ["technical", "hr"]:
+            raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
         # Handle missing filename - try to infer from content-type or use default
         filename = file.filename or 'uploaded_file'
         if not file.filename:
@@ -100,8 +116,26 @@ async def parse_document(file: UploadFile = File(...)):
         logger.info(f"Processing file: {filename} ({file_size} bytes, type: {file_ext})")
         
         # Process document with GPT-4o-mini Vision
+        upload_id = str(uuid.uuid4())
         try:
-            result = ocr_processor.process_document(file_bytes, file_ext)
+            with usage_scope(upload_id=upload_id):
+                result = ocr_processor.process_document(file_bytes, file_ext)
+            result["upload_id"] = upload_id
+
+            settings = get_settings()
+            if company_id and settings.question_dedupe_enabled and result.get("questions"):
+                with get_db() as db:
+                    dedupe_indexes = [
+                        get_dedupe_index(db, company_id, t)
+                        for t in ([interview_type] if interview_type else ["technical", "hr"])
+                    ]
+                for q in result["questions"]:
+                    signature = minhash(q["text"])
+                    for dedupe_index in dedupe_indexes:
+                        duplicate_of = dedupe_index.find_duplicate(signature, settings.question_dedupe_threshold)
+                        if duplicate_of:
+                            q["duplicate_of"] = duplicate_of
+                            break
             logger.info(f"OCR result: {len(result.get('questions', []))} valid questions extracted")
             
             status_code = 200 if result['success'] else 400
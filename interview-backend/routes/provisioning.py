@@ -0,0 +1,121 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Form, HTTPException, Request
+from database import get_db
+from routes.companies import is_admin
+from services.provisioning_service import MAX_CANDIDATES, resolve_candidates, run_provisioning_job
+
+router = APIRouter()
+
+@router.post("/sessions/bulk")
+async def provision_sessions(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    candidates: str = Form(...),  # JSON array of user ids or emails
+    interview_mode: str = Form(...),  # "general" or "company"
+    duration: int = Form(...),
+    interview_type: str = Form("technical"),
+    job_description: Optional[str] = Form(None),
+    company_id: Optional[str] = Form(None)
+):
+    """Create sessions for a whole drive in the background (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if interview_mode not in ["general", "company"]:
+        raise HTTPException(status_code=400, detail="Invalid interview mode. Must be 'general' or 'company'")
+
+    if interview_type not in ["technical", "hr"]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
+    try:
+        candidate_list = json.loads(candidates)
+        if not isinstance(candidate_list, list) or not all(isinstance(c, str) for c in candidate_list):
+            raise ValueError("Candidates must be a JSON array of user ids or emails")
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON format for candidates")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not candidate_list:
+        raise HTTPException(status_code=400, detail="At least one candidate is required")
+    if len(candidate_list) > MAX_CANDIDATES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CANDIDATES} candidates per request")
+
+    with get_db() as db:
+        if interview_mode == "general":
+            if not job_description:
+                raise HTTPException(status_code=400, detail="Job description is required for general interview")
+            company_id = None
+        else:
+            if not company_id:
+                raise HTTPException(status_code=400, detail="Company ID is required for company-based interview")
+
+            company = db.companies.find_one({"id": company_id})
+            if not company:
+                raise HTTPException(status_code=404, detail="Company not found")
+
+            if not db.company_questions.find_one({"company_id": company_id, "interview_type": interview_type}, {"_id": 1}):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No {interview_type} questions found for this company"
+                )
+
+            # Use company name as job description for display
+            if not job_description:
+                job_description = f"Interview for {company['name']}"
+
+        user_ids, unknown = resolve_candidates(db, candidate_list)
+        if not user_ids:
+            raise HTTPException(status_code=400, detail="None of the candidates are registered users")
+
+        job = {
+            "id": str(uuid.uuid4()),
+            "created_by": request.state.user["_id"],
+            "interview_mode": interview_mode,
+            "job_description": job_description,
+            "company_id": company_id,
+            "duration_seconds": duration,
+            "interview_type": interview_type,
+            "status": "resolving_questions",
+            "total": len(user_ids),
+            "created": 0,
+            "unknown_candidates": unknown,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "finished_at": None
+        }
+        db.provisioning_jobs.insert_one(job)
+        job.pop("_id", None)
+
+    background_tasks.add_task(run_provisioning_job, job["id"], user_ids)
+
+    return {
+        "success": True,
+        "job": job
+    }
+
+@router.get("/sessions/bulk/{job_id}")
+async def get_provisioning_job(job_id: str, request: Request):
+    """Progress of a bulk provisioning job (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    with get_db() as db:
+        job = db.provisioning_jobs.find_one({"id": job_id}, {"_id": 0})
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Provisioning job not found")
+
+    return {
+        "success": True,
+        "job": job
+    }
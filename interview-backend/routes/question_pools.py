@@ -0,0 +1,82 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Request, Form
+from database import get_db
+from routes.companies import is_admin
+from services.question_pool_service import build_question_pool, jd_hash
+
+router = APIRouter()
+
+@router.post("/question-pools")
+async def create_question_pool(
+    request: Request,
+    job_description: str = Form(...),
+    interview_type: str = Form("technical"),
+    pool_size: int = Form(None),
+    rebuild: bool = Form(False)
+):
+    """Pre-build the shared question pool for a drive's job description (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if interview_type not in ["technical", "hr"]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
+    if pool_size is not None and not 1 <= pool_size <= 200:
+        raise HTTPException(status_code=400, detail="pool_size must be between 1 and 200")
+
+    pool = await asyncio.to_thread(build_question_pool, job_description, interview_type, pool_size, rebuild)
+
+    return {
+        "success": True,
+        "pool": pool
+    }
+
+@router.get("/question-pools")
+async def list_question_pools(request: Request):
+    """List question pools without their questions (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    with get_db() as db:
+        pools = list(db.question_pools.find({}, {"_id": 0, "questions": 0, "job_description": 0}))
+
+    return {
+        "success": True,
+        "pools": pools
+    }
+
+@router.delete("/question-pools")
+async def delete_question_pool(
+    request: Request,
+    job_description: str = Form(...),
+    interview_type: str = Form("technical")
+):
+    """Drop a JD's question pool so the next session regenerates it (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if interview_type not in ["technical", "hr"]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
+    with get_db() as db:
+        result = db.question_pools.delete_one({
+            "jd_hash": jd_hash(job_description),
+            "interview_type": interview_type
+        })
+
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Question pool not found")
+
+    return {
+        "success": True,
+        "message": "Question pool deleted"
+    }
@@ -0,0 +1,45 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Query
+from routes.companies import is_admin
+from services.pagination import parse_fields
+from services.question_search_service import SEARCHABLE_FIELDS, search_questions
+
+router = APIRouter()
+
+@router.get("/questions/search")
+async def search_company_questions(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=200),
+    company_id: Optional[str] = None,
+    interview_type: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    fields: Optional[str] = None,  # comma-separated subset of SEARCHABLE_FIELDS
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """Search the question banks of all companies, ranked by relevance (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if interview_type and interview_type not in ["technical", "hr"]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
+    try:
+        projection = parse_fields(fields, SEARCHABLE_FIELDS)
+        result = search_questions(
+            query=q.strip() if q and q.strip() else None,
+            filters={"company_id": company_id, "interview_type": interview_type, "difficulty": difficulty},
+            projection=projection,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "success": True,
+        **result
+    }
@@ -0,0 +1,183 @@
+from fastapi import APIRouter, BackgroundTasks, Form, HTTPException, Request, Query
+from database import get_db
+from routes.companies import is_admin
+from routes.cohorts import is_staff
+from services.score_rollups import ALL_TYPES, GLOBAL_KEY, SCOPES, backfill_rollups, get_rollup, leaderboard, percentile_rank
+
+router = APIRouter()
+
+def _check_interview_type(interview_type: str):
+    if interview_type not in ["technical", "hr", ALL_TYPES]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical', 'hr' or 'all'")
+
+@router.get("/rollups/me")
+async def get_my_rollup(request: Request, interview_type: str = ALL_TYPES):
+    """Score rollup of the current user's completed sessions"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    _check_interview_type(interview_type)
+
+    with get_db() as db:
+        rollup = get_rollup(db, "user", request.state.user["_id"], interview_type)
+
+    return {
+        "success": True,
+        "rollup": rollup
+    }
+
+@router.get("/rollups/{scope}/{key}")
+async def get_scope_rollup(scope: str, key: str, request: Request, interview_type: str = ALL_TYPES):
+    """Score rollup of a user, company or drive (Mentor/Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_staff(request.state.user):
+        raise HTTPException(status_code=403, detail="Mentor or admin access required")
+
+    if scope not in SCOPES:
+        raise HTTPException(status_code=400, detail=f"Invalid scope. Must be one of: {', '.join(SCOPES)}")
+
+    _check_interview_type(interview_type)
+
+    with get_db() as db:
+        rollup = get_rollup(db, scope, key, interview_type)
+
+    if not rollup:
+        raise HTTPException(status_code=404, detail="No completed sessions for this rollup")
+
+    return {
+        "success": True,
+        "rollup": rollup
+    }
+
+@router.get("/rollups/{scope}/{key}/percentile")
+async def get_score_percentile(
+    scope: str,
+    key: str,
+    request: Request,
+    score: float = Query(..., ge=0, le=10),
+    interview_type: str = ALL_TYPES
+):
+    """Percentile of a score within a user, company, drive or all sessions (Mentor/Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_staff(request.state.user):
+        raise HTTPException(status_code=403, detail="Mentor or admin access required")
+
+    if scope not in SCOPES:
+        raise HTTPException(status_code=400, detail=f"Invalid scope. Must be one of: {', '.join(SCOPES)}")
+
+    _check_interview_type(interview_type)
+
+    with get_db() as db:
+        rollup = db.score_rollups.find_one(
+            {"scope": scope, "key": key, "interview_type": interview_type},
+            {"_id": 0, "sessions": 1, "score_histogram": 1}
+        )
+
+    if not rollup:
+        raise HTTPException(status_code=404, detail="No completed sessions for this rollup")
+
+    return {
+        "success": True,
+        "score": score,
+        "percentile": percentile_rank(rollup.get("score_histogram", {}), score),
+        "sessions": rollup.get("sessions", 0)
+    }
+
+@router.get("/sessions/{session_id}/percentile")
+async def get_session_percentile(session_id: str, request: Request):
+    """Where a completed session's score stands in its company, drive and overall (owner, mentor or admin)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    with get_db() as db:
+        session = db.interview_sessions.find_one(
+            {"id": session_id},
+            {"_id": 0, "user_id": 1, "company_id": 1, "provisioning_job_id": 1, "interview_type": 1, "final_score": 1, "status": 1}
+        )
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        if session["user_id"] != request.state.user["_id"] and not is_staff(request.state.user):
+            raise HTTPException(status_code=403, detail="Access denied")
+
+        if session.get("status") != "completed" or session.get("final_score") is None:
+            raise HTTPException(status_code=400, detail="Session has not been scored yet")
+
+        interview_type = session.get("interview_type", "technical")
+        percentiles = {}
+        for scope, key in (("company", session.get("company_id")), ("drive", session.get("provisioning_job_id")), ("global", GLOBAL_KEY)):
+            if not key:
+                continue
+            rollup = db.score_rollups.find_one(
+                {"scope": scope, "key": key, "interview_type": interview_type},
+                {"_id": 0, "sessions": 1, "score_histogram": 1}
+            )
+            if rollup:
+                percentiles[scope] = {
+                    "key": key,
+                    "percentile": percentile_rank(rollup.get("score_histogram", {}), session["final_score"]),
+                    "sessions": rollup.get("sessions", 0)
+                }
+
+    return {
+        "success": True,
+        "session_id": session_id,
+        "interview_type": interview_type,
+        "final_score": session["final_score"],
+        "percentiles": percentiles
+    }
+
+@router.get("/leaderboards/{scope}/{key}")
+async def get_leaderboard(
+    scope: str,
+    key: str,
+    request: Request,
+    interview_type: str = ALL_TYPES,
+    limit: int = Query(10, ge=1, le=100)
+):
+    """Top candidates of a company or drive by best score (Mentor/Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_staff(request.state.user):
+        raise HTTPException(status_code=403, detail="Mentor or admin access required")
+
+    if scope not in ["company", "drive"]:
+        raise HTTPException(status_code=400, detail="Invalid scope. Must be 'company' or 'drive'")
+
+    _check_interview_type(interview_type)
+
+    with get_db() as db:
+        entries = leaderboard(db, scope, key, interview_type, limit)
+
+    return {
+        "success": True,
+        "leaderboard": entries
+    }
+
+def _run_backfill(rebuild: bool):
+    with get_db() as db:
+        backfill_rollups(db, rebuild)
+
+@router.post("/rollups/backfill")
+async def start_rollup_backfill(request: Request, background_tasks: BackgroundTasks, rebuild: bool = Form(False)):
+    """
+    Fold completed sessions analyzed before rollups existed; with rebuild,
+    recompute every rollup from scratch (Admin only)
+    """
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    background_tasks.add_task(_run_backfill, rebuild)
+
+    return {
+        "success": True,
+        "message": "Rollup rebuild started" if rebuild else "Rollup backfill started"
+    }
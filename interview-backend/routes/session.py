@@ -1,16 +1,41 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, BackgroundTasks, Query
+from fastapi.responses import Response, StreamingResponse
 from database import get_db
+from config import get_settings
+from services.resume_profile_service import get_or_create_resume_profile
 from services.pdf_service import extract_text_from_pdf
-from services.llm_service import generate_questions
+from services.llm_service import generate_questions, stream_questions
+from services.scoring_service import precompute_reference_answers
+from services.question_pool_service import select_session_questions
+from services.question_bank_service import select_company_questions, fallback_questions
+from services.usage_ledger import usage_scope
+from services.company_catalog import get_catalog
+from services.pagination import encode_cursor, decode_cursor
+from services.versioning import is_not_modified, new_version, not_modified_response, session_validators, stamp, strong_etag, validator_headers
+import asyncio
+import json
+import logging
 import uuid
 from datetime import datetime
 from typing import Optional
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Late generations of degraded sessions, referenced until they finish
+_degraded_tasks = set()
+
+# Fields returned by the /my-sessions list
+SESSION_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "status": 1, "final_score": 1, "company_id": 1, "interview_mode": 1,
+    "interview_type": 1, "job_description": 1, "duration_seconds": 1, "created_at": 1, "completed_at": 1
+}
+JD_PREVIEW_CHARS = 200
 
 @router.post("/create-session")
 async def create_session(
     request: Request,
+    background_tasks: BackgroundTasks,
     interview_mode: str = Form(...),  # "general" or "company"
     job_description: str = Form(None),
     resume: UploadFile = File(None),
@@ -28,7 +53,10 @@ async def create_session(
 
     questions = []
     resume_text = ""
+    resume_profile_id = None
     session_company_id = None
+    degraded = False
+    session_id = str(uuid.uuid4())
 
     if interview_mode == "general":
         # General interview - generate questions using LLM
@@ -38,20 +66,75 @@ async def create_session(
             raise HTTPException(status_code=400, detail="Resume is required for general interview")
         
         resume_bytes = await resume.read()
-        resume_text = extract_text_from_pdf(resume_bytes)
 
-        questions = generate_questions(
-            job_description,
-            resume_text,
-            duration,
-            interview_type
-        )
+        with usage_scope(session_id=session_id):
+            # Prompts use the compact per-user resume profile, built once per unique resume
+            # PDF parsing and summarization block, so run them off the event loop
+            resume_profile = await asyncio.to_thread(get_or_create_resume_profile, user_id, resume_bytes)
+            resume_text = resume_profile["summary"]
+            resume_profile_id = resume_profile["id"]
+
+            # Questions generated too late for an earlier degraded attempt at the same interview
+            questions = None
+            if get_settings().degraded_session_upgrade:
+                questions = await asyncio.to_thread(
+                    _claim_late_questions,
+                    user_id,
+                    resume_profile_id,
+                    job_description,
+                    interview_type,
+                    duration
+                )
+
+            if questions:
+                logger.info(f"Session {session_id} uses questions generated late for a degraded session")
+            elif get_settings().question_pool_enabled:
+                # Drive cohorts share one generated pool per JD; mostly a DB read
+                questions = await asyncio.to_thread(
+                    select_session_questions,
+                    job_description,
+                    resume_text,
+                    duration,
+                    interview_type
+                )
+            else:
+                generation = asyncio.ensure_future(asyncio.to_thread(
+                    generate_questions,
+                    job_description,
+                    resume_text,
+                    duration,
+                    interview_type
+                ))
+                slo_seconds = get_settings().question_generation_slo_seconds
+                try:
+                    if slo_seconds > 0:
+                        questions = await asyncio.wait_for(asyncio.shield(generation), slo_seconds)
+                    else:
+                        questions = await generation
+                except asyncio.TimeoutError:
+                    # Provider is slow: start the interview on stored questions instead
+                    logger.warning(f"Question generation exceeded {slo_seconds}s for session {session_id}, serving stored questions")
+                    degraded = True
+                    # Stored-question ranking is blocking work; keep it off the event loop
+                    questions = await asyncio.to_thread(
+                        _load_fallback_questions,
+                        job_description,
+                        interview_type,
+                        duration
+                    )
     else:
         # Company-based interview - get questions from database
         if not company_id:
             raise HTTPException(status_code=400, detail="Company ID is required for company-based interview")
         
         session_company_id = company_id
+
+        # JD and resume only steer which stored questions are picked (no LLM call)
+        ranking_text = job_description or ""
+        if resume:
+            resume_bytes = await resume.read()
+            if resume_bytes:
+                ranking_text += "\n" + await asyncio.to_thread(extract_text_from_pdf, resume_bytes)
         
         with get_db() as db:
             # Verify company exists
@@ -59,46 +142,27 @@ async def create_session(
             if not company:
                 raise HTTPException(status_code=404, detail="Company not found")
             
-            # Get questions for this company and interview type
-            company_questions = list(db.company_questions.find({
-                "company_id": company_id,
-                "interview_type": interview_type
-            }))
+            # Pick N questions (90 seconds per question) relevant to the JD/resume, skipping ones the user has seen
+            questions = select_company_questions(db, company_id, interview_type, duration, user_id, ranking_text)
             
-            if not company_questions:
+            if not questions:
                 raise HTTPException(
                     status_code=404, 
                     detail=f"No {interview_type} questions found for this company"
                 )
             
-            # Calculate how many questions to use based on duration (90 seconds per question)
-            max_questions = max(1, duration // 90)
-            
-            # Select questions (if more than needed, take first N)
-            selected_questions = company_questions[:max_questions]
-            
-            # Format questions to match the expected structure
-            questions = []
-            for idx, q in enumerate(selected_questions, 1):
-                questions.append({
-                    "id": f"q{idx}",
-                    "text": q["question_text"],
-                    "estimated_seconds": 90
-                })
-            
             # Use company name as job description for display
             if not job_description:
                 job_description = f"Interview for {company['name']}"
 
-    session_id = str(uuid.uuid4())
-
     with get_db() as db:
         session_data = {
             "id": session_id,
             "user_id": user_id,
             "interview_mode": interview_mode,
             "job_description": job_description or "",
-            "resume_text": resume_text,
+            "resume_text": resume_text,  # compact resume profile summary
+            "resume_profile_id": resume_profile_id,
             "duration_seconds": duration,
             "interview_type": interview_type,
             "questions": questions,
@@ -107,32 +171,234 @@ async def create_session(
             "created_at": datetime.utcnow(),
             "completed_at": None
         }
+        session_data.update(new_version(session_data["created_at"]))
         
         if session_company_id:
             session_data["company_id"] = session_company_id
+
+        if degraded:
+            session_data["degraded"] = True
+            session_data["degraded_reason"] = "generation_slo"
         
         db.interview_sessions.insert_one(session_data)
 
+    if degraded:
+        # Let the late generation finish; with upgrades on it is kept for the next attempt
+        task = asyncio.create_task(_finish_degraded_session(session_id, generation))
+        _degraded_tasks.add(task)
+        task.add_done_callback(_degraded_tasks.discard)
+    elif get_settings().precompute_reference_answers and questions:
+        background_tasks.add_task(precompute_reference_answers, session_id)
+
     return {
         "session_id": session_id,
         "questions": questions,
         "duration_seconds": duration,
         "interview_type": interview_type,
         "interview_mode": interview_mode,
-        "company_id": session_company_id
+        "company_id": session_company_id,
+        "degraded": degraded
     }
 
 
-@router.get("/session/{session_id}")
-async def get_session(session_id: str, request: Request):
+async def _finish_degraded_session(session_id: str, generation):
+    """
+    Wait for the generation a degraded session gave up on.
+
+    The client already holds the fallback questions, so they are never
+    replaced. With DEGRADED_SESSION_UPGRADE on, the generated questions are
+    kept on the session (late_questions) and served to the candidate's next
+    attempt at the same interview instead of generating again.
+    """
+    try:
+        questions = await generation
+    except Exception as e:
+        logger.warning(f"Late question generation failed for degraded session {session_id}: {e}")
+        questions = None
+
+    if questions and get_settings().degraded_session_upgrade:
+        with get_db() as db:
+            # Server-side only, so not a client-visible write
+            db.interview_sessions.update_one({"id": session_id}, {"$set": {"late_questions": questions}})
+
+    if get_settings().precompute_reference_answers:
+        await asyncio.to_thread(precompute_reference_answers, session_id)
+
+
+def _load_fallback_questions(job_description: str, interview_type: str, duration: int) -> list:
+    with get_db() as db:
+        return fallback_questions(db, job_description, interview_type, duration)
+
+
+def _claim_late_questions(user_id: str, resume_profile_id: str, job_description: str, interview_type: str, duration: int):
+    """
+    Take the late-generated questions of the user's latest degraded session
+    with the same resume, JD, type and duration, or None. Claimed atomically
+    so each set is used by one session only.
+    """
+    with get_db() as db:
+        session = db.interview_sessions.find_one_and_update(
+            {
+                "user_id": user_id,
+                "resume_profile_id": resume_profile_id,
+                "job_description": job_description,
+                "interview_type": interview_type,
+                "duration_seconds": duration,
+                "late_questions": {"$exists": True}
+            },
+            {"$unset": {"late_questions": ""}},
+            projection={"_id": 0, "late_questions": 1},
+            sort=[("created_at", -1)]
+        )
+    return session["late_questions"] if session else None
+
+
+def iter_pool_questions(job_description: str, resume_text: str, duration: int, interview_type: str):
+    """Generator over pool-selected questions, so the stream can treat both sources alike."""
+    yield from select_session_questions(job_description, resume_text, duration, interview_type)
+
+
+def _push_question(session_id: str, question: dict):
+    with get_db() as db:
+        db.interview_sessions.update_one(
+            {"id": session_id},
+            stamp({"$push": {"questions": question}})
+        )
+
+
+def _finish_question_stream(session_id: str, questions, question_count: int):
+    """
+    Close the question generator (which records its usage) and settle the
+    session status. Both block, so the stream runs this in a worker thread.
+    """
+    try:
+        questions.close()
+    finally:
+        # Upload-answer may already have moved the session to in_progress
+        with get_db() as db:
+            db.interview_sessions.update_one(
+                {"id": session_id, "status": "generating"},
+                stamp({"$set": {"status": "created" if question_count else "failed"}})
+            )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/create-session/stream")
+async def create_session_stream(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    job_description: str = Form(...),
+    resume: UploadFile = File(...),
+    duration: int = Form(...),
+    interview_type: str = Form("technical")
+):
+    """
+    General-mode create-session that streams questions as Server-Sent Events.
+
+    Events: "session" (ids and settings) first, then one "question" per
+    generated question, persisted to the session as it arrives, then "done"
+    (or "error"). The interview can start as soon as the first question event
+    is received.
+    """
     user_id = request.state.user["_id"]
 
+    if interview_type not in ["technical", "hr"]:
+        raise HTTPException(status_code=400, detail="Invalid interview type. Must be 'technical' or 'hr'")
+
+    session_id = str(uuid.uuid4())
+    resume_bytes = await resume.read()
+
+    with usage_scope(session_id=session_id):
+        resume_profile = await asyncio.to_thread(get_or_create_resume_profile, user_id, resume_bytes)
+
+    created_at = datetime.utcnow()
     with get_db() as db:
-        session = db.interview_sessions.find_one({
+        db.interview_sessions.insert_one({
             "id": session_id,
-            "user_id": user_id
+            "user_id": user_id,
+            "interview_mode": "general",
+            "job_description": job_description,
+            "resume_text": resume_profile["summary"],  # compact resume profile summary
+            "resume_profile_id": resume_profile["id"],
+            "duration_seconds": duration,
+            "interview_type": interview_type,
+            "questions": [],
+            "status": "generating",
+            "final_score": None,
+            "created_at": created_at,
+            "completed_at": None,
+            **new_version(created_at)
+        })
+
+    if get_settings().precompute_reference_answers:
+        # Runs after the stream has finished, once all questions are stored
+        background_tasks.add_task(precompute_reference_answers, session_id)
+
+    async def event_stream():
+        yield _sse("session", {
+            "session_id": session_id,
+            "duration_seconds": duration,
+            "interview_type": interview_type,
+            "interview_mode": "general",
+            "company_id": None
         })
 
+        question_count = 0
+        failed = False
+        with usage_scope(session_id=session_id):
+            if get_settings().question_pool_enabled:
+                questions = iter_pool_questions(job_description, resume_profile["summary"], duration, interview_type)
+            else:
+                questions = stream_questions(job_description, resume_profile["summary"], duration, interview_type)
+            try:
+                while True:
+                    question = await asyncio.to_thread(next, questions, None)
+                    if question is None:
+                        break
+                    await asyncio.to_thread(_push_question, session_id, question)
+                    question_count += 1
+                    yield _sse("question", question)
+            except Exception as e:
+                failed = True
+                yield _sse("error", {"detail": f"Question generation failed: {str(e)}"})
+            finally:
+                await asyncio.to_thread(_finish_question_stream, session_id, questions, question_count)
+
+        if not failed:
+            if question_count:
+                yield _sse("done", {"session_id": session_id, "question_count": question_count})
+            else:
+                yield _sse("error", {"detail": "No questions were generated"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/session/{session_id}")
+async def get_session(session_id: str, request: Request, response: Response):
+    user_id = request.state.user["_id"]
+
+    # Polling clients revalidate with If-None-Match; no full read when nothing changed
+    validators = session_validators(session_id, user_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    etag = strong_etag("session", session_id, validators[0])
+    if is_not_modified(request, etag, validators[1]):
+        return not_modified_response(etag, validators[1])
+
+    with get_db() as db:
+        # Precomputed reference answers stay server-side until the session is analyzed
+        session = db.interview_sessions.find_one(
+            {"id": session_id, "user_id": user_id},
+            {"reference_answers": 0, "rollup": 0, "rollup_pending": 0, "late_questions": 0}
+        )
+
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
@@ -142,6 +408,12 @@ async def get_session(session_id: str, request: Request):
         for a in answers:
             a.pop("_id", None)
 
+    last_modified = session.get("updated_at") or session.get("completed_at") or session.get("created_at")
+    response.headers.update(validator_headers(
+        strong_etag("session", session_id, session.get("version", 0)),
+        last_modified
+    ))
+
     return {
         "session": session,
         "answers": answers
@@ -149,8 +421,33 @@ async def get_session(session_id: str, request: Request):
 
 
 
+@router.post("/session/{session_id}/abandon")
+async def abandon_session(session_id: str, request: Request):
+    """Mark an unfinished session as abandoned, stopping any background precomputation."""
+    user_id = request.state.user["_id"]
+
+    with get_db() as db:
+        result = db.interview_sessions.update_one(
+            {"id": session_id, "user_id": user_id, "status": {"$ne": "completed"}},
+            stamp({"$set": {"status": "abandoned"}})
+        )
+
+        if result.matched_count == 0:
+            raise HTTPException(status_code=404, detail="Session not found or already completed")
+
+    return {"success": True, "status": "abandoned"}
+
+
 @router.get("/my-sessions")
-async def get_my_sessions(request: Request):
+async def get_my_sessions(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    The user's sessions, newest first, as slim list items (no questions,
+    resume or reference answers). Pass next_cursor to get the next page.
+    """
     # ✅ AUTH CHECK (prevents crash)
     if not request.state.user:
         raise HTTPException(status_code=401, detail="Unauthorized")
@@ -158,16 +455,64 @@ async def get_my_sessions(request: Request):
     # ✅ FIXED KEY NAME
     user_id = request.state.user["_id"]
 
-    print("Fetching sessions for user:", user_id)
+    query = {"user_id": user_id}
+    if cursor:
+        try:
+            after = decode_cursor(cursor, {"created_at": datetime, "id": str})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query["$or"] = [
+            {"created_at": {"$lt": after["created_at"]}},
+            {"created_at": after["created_at"], "id": {"$lt": after["id"]}}
+        ]
 
     with get_db() as db:
+        # Served by the (user_id, created_at, id) index
         sessions = list(
             db.interview_sessions
-            .find({"user_id": user_id})
-            .sort("created_at", -1)
+            .find(query, SESSION_LIST_PROJECTION)
+            .sort([("created_at", -1), ("id", -1)])
+            .limit(limit + 1)
         )
 
-        for s in sessions:
-            s.pop("_id", None)
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = encode_cursor({"created_at": sessions[-1]["created_at"], "id": sessions[-1]["id"]})
+
+    company_names = {}
+    if any(s.get("company_id") for s in sessions):
+        companies, _, _ = get_catalog()
+        company_names = {c["id"]: c["name"] for c in companies}
+
+    for s in sessions:
+        s["job_description"] = (s.get("job_description") or "")[:JD_PREVIEW_CHARS]
+        if s.get("company_id"):
+            s["company_name"] = company_names.get(s["company_id"])
 
-    return {"sessions": sessions}
+    return {"sessions": sessions, "next_cursor": next_cursor}
+
+
+@router.get("/my-sessions/summary")
+async def get_my_sessions_summary(request: Request):
+    """Session counts per status and the average final score of the user's completed sessions."""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    user_id = request.state.user["_id"]
+
+    with get_db() as db:
+        rows = list(db.interview_sessions.aggregate([
+            {"$match": {"user_id": user_id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}, "avg_score": {"$avg": "$final_score"}}}
+        ]))
+
+    by_status = {row["_id"]: row["count"] for row in rows}
+    completed = next((row for row in rows if row["_id"] == "completed"), None)
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "completed": by_status.get("completed", 0),
+        "avg_score": round(completed["avg_score"], 2) if completed and completed["avg_score"] is not None else None
+    }
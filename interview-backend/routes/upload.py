@@ -1,7 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
 from database import get_db
+from config import get_settings
 from services.transcription_service import transcribe_audio
+from services.scoring_service import score_answer, PENDING
+from services.usage_ledger import usage_scope
+from services.versioning import forget_session, new_version, stamp
 from pathlib import Path
+import asyncio
 import os
 import uuid
 import shutil
@@ -17,6 +22,7 @@ router = APIRouter()
 async def upload_answer(
     session_id: str,
     question_id: str,
+    background_tasks: BackgroundTasks,
     audio: UploadFile = File(...)
 ):
     file_path = None
@@ -49,14 +55,28 @@ async def upload_answer(
                 detail=f"Failed to save audio file: {str(e)}"
             )
 
+        # Company sessions attribute transcription to the company, as scoring does
+        with get_db() as db:
+            session = db.interview_sessions.find_one({"id": session_id}, {"_id": 0, "company_id": 1})
+        company_id = (session or {}).get("company_id")
+
         try:
-            transcript = transcribe_audio(str(file_path))
+            with usage_scope(session_id=session_id, company_id=company_id):
+                # Retry backoff sleeps, so keep it off the event loop
+                transcript = await asyncio.to_thread(transcribe_audio, str(file_path))
         except Exception as e:
             transcript = ""
             print(f"Transcription failed for {file_path}: {str(e)}")
 
         audio_path_relative = f"uploads/{filename}"
 
+        # Queue scoring right behind the upload so analysis only has to aggregate
+        schedule_scoring = bool(transcript) and get_settings().incremental_scoring
+        scoring_fields = {
+            "score": None,
+            "scoring_status": PENDING if schedule_scoring else None
+        }
+
         max_retries = 3
         retry_count = 0
 
@@ -71,11 +91,11 @@ async def upload_answer(
                     if existing:
                         db.interview_answers.update_one(
                             {"_id": existing["_id"]},
-                            {"$set": {
+                            stamp({"$set": {
                                 "audio_path": audio_path_relative,
                                 "transcript": transcript,
-                                "updated_at": datetime.utcnow()
-                            }}
+                                **scoring_fields
+                            }})
                         )
                     else:
                         answer_doc = {
@@ -84,14 +104,17 @@ async def upload_answer(
                             "question_id": question_id,
                             "audio_path": audio_path_relative,
                             "transcript": transcript,
-                            "created_at": datetime.utcnow()
+                            "created_at": datetime.utcnow(),
+                            **scoring_fields
                         }
+                        answer_doc.update(new_version(answer_doc["created_at"]))
                         db.interview_answers.insert_one(answer_doc)
 
                     db.interview_sessions.update_one(
                         {"id": session_id},
-                        {"$set": {"status": "in_progress"}}
+                        stamp({"$set": {"status": "in_progress"}})
                     )
+                    forget_session(session_id)
 
                 break
 
@@ -104,6 +127,9 @@ async def upload_answer(
                     )
                 time.sleep(0.1 * retry_count)
 
+        if schedule_scoring:
+            background_tasks.add_task(score_answer, session_id, question_id, transcript)
+
         return {
             "transcript": transcript,
             "audio_path": audio_path_relative
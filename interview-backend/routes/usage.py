@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, Request, Query
+from database import get_db
+from routes.companies import is_admin
+from services.usage_ledger import session_usage, upload_usage, company_usage, daily_usage
+
+router = APIRouter()
+
+@router.get("/usage/session/{session_id}")
+async def get_session_usage(session_id: str, request: Request):
+    """LLM and transcription usage of one interview session (owner or admin)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        with get_db() as db:
+            owned = db.interview_sessions.find_one(
+                {"id": session_id, "user_id": request.state.user["_id"]},
+                {"_id": 1}
+            )
+        if not owned:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+    return {
+        "success": True,
+        "session_id": session_id,
+        **session_usage(session_id)
+    }
+
+@router.get("/usage/upload/{upload_id}")
+async def get_upload_usage(upload_id: str, request: Request):
+    """LLM usage of one OCR document upload (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return {
+        "success": True,
+        "upload_id": upload_id,
+        **upload_usage(upload_id)
+    }
+
+@router.get("/usage/company/{company_id}")
+async def get_company_usage(company_id: str, request: Request):
+    """LLM and transcription usage of all sessions of a company (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return {
+        "success": True,
+        "company_id": company_id,
+        **company_usage(company_id)
+    }
+
+@router.get("/usage/daily")
+async def get_daily_usage(request: Request, days: int = Query(30, ge=1, le=365)):
+    """Per-day LLM and transcription usage totals (Admin only)"""
+    if not request.state.user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if not is_admin(request.state.user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return {
+        "success": True,
+        "days": daily_usage(days)
+    }
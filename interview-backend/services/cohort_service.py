@@ -0,0 +1,139 @@
+from datetime import datetime
+from bson import ObjectId
+from database import get_db
+from services.pagination import encode_cursor, decode_cursor
+
+# ---------------------------
+# COHORT QUERIES OVER interview_sessions (MENTOR / ADMIN DASHBOARDS)
+# ---------------------------
+
+COHORT_FIELDS = (
+    "id", "user_id", "company_id", "interview_mode", "interview_type", "status", "final_score",
+    "duration_seconds", "created_at", "completed_at", "provisioning_job_id"
+)
+
+# Sort keys and their value types; every page is ordered by (sort key, id) so the cursor is unique
+SORT_TYPES = {"created_at": datetime, "final_score": (int, float), "completed_at": datetime}
+SORT_FIELDS = tuple(SORT_TYPES)
+
+
+def build_cohort_query(filters: dict, sort: str = "created_at", descending: bool = True, cursor: str = None) -> tuple:
+    """
+    Translate cohort filters into (query, sort spec).
+
+    filters may hold company_id, provisioning_job_id (drive), interview_type,
+    status (equality), min_score / max_score and created_from / created_to
+    (ranges). Sorting by final_score or completed_at only returns sessions
+    that have one. Raises ValueError for an unknown sort key or a malformed
+    cursor.
+    """
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort. Must be one of: {', '.join(SORT_FIELDS)}")
+
+    query = {
+        key: filters[key]
+        for key in ("company_id", "provisioning_job_id", "interview_type", "status")
+        if filters.get(key) is not None
+    }
+
+    score = {}
+    if filters.get("min_score") is not None:
+        score["$gte"] = filters["min_score"]
+    if filters.get("max_score") is not None:
+        score["$lte"] = filters["max_score"]
+    if sort == "final_score" and not score:
+        score["$type"] = "number"
+    if score:
+        query["final_score"] = score
+
+    created = {}
+    if filters.get("created_from") is not None:
+        created["$gte"] = filters["created_from"]
+    if filters.get("created_to") is not None:
+        created["$lt"] = filters["created_to"]
+    if created:
+        query["created_at"] = created
+
+    if sort == "completed_at":
+        query.setdefault("completed_at", {"$type": "date"})
+
+    if cursor:
+        after = decode_cursor(cursor, {sort: SORT_TYPES[sort], "id": str})
+        op = "$lt" if descending else "$gt"
+        # $and keeps any range filter on the sort field intact
+        query["$and"] = [{"$or": [
+            {sort: {op: after[sort]}},
+            {sort: after[sort], "id": {op: after["id"]}}
+        ]}]
+
+    direction = -1 if descending else 1
+    return query, [(sort, direction), ("id", direction)]
+
+
+def attach_students(db, sessions: list):
+    """Add student_name / student_email from users in one lookup per page."""
+    object_ids = [ObjectId(s["user_id"]) for s in sessions if ObjectId.is_valid(s.get("user_id") or "")]
+    if not object_ids:
+        return
+    users = {
+        str(user["_id"]): user
+        for user in db.users.find({"_id": {"$in": object_ids}}, {"name": 1, "email": 1})
+    }
+    for session in sessions:
+        user = users.get(session.get("user_id"))
+        session["student_name"] = user.get("name") if user else None
+        session["student_email"] = user.get("email") if user else None
+
+
+def query_cohort(filters: dict, projection: dict = None, sort: str = "created_at", descending: bool = True, limit: int = 50, cursor: str = None) -> dict:
+    """
+    One page of sessions matching the cohort filters, with student name and
+    email attached. Pass the returned next_cursor for the following page.
+    """
+    query, sort_spec = build_cohort_query(filters, sort, descending, cursor)
+    projection = projection or {"_id": 0, **{field: 1 for field in COHORT_FIELDS}}
+
+    with get_db() as db:
+        sessions = list(
+            db.interview_sessions
+            .find(query, {**projection, sort: 1, "id": 1})
+            .sort(sort_spec)
+            .limit(limit + 1)
+        )
+
+        next_cursor = None
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            next_cursor = encode_cursor({sort: sessions[-1][sort], "id": sessions[-1]["id"]})
+
+        if "user_id" in projection:
+            attach_students(db, sessions)
+
+    if sort not in projection:
+        for session in sessions:
+            session.pop(sort, None)
+
+    return {"sessions": sessions, "next_cursor": next_cursor}
+
+
+def explain_cohort_query(db, filters: dict, sort: str = "created_at", descending: bool = True) -> dict:
+    """
+    Winning plan summary of a cohort query: {"stages": [...], "index": names}
+    over the whole plan tree, so index scans under OR / SORT_MERGE count too.
+    Used to check that every supported filter combination avoids COLLSCAN.
+    """
+    query, sort_spec = build_cohort_query(filters, sort, descending)
+    explain = db.interview_sessions.find(query).sort(sort_spec).limit(50).explain()
+
+    stages, index_names = [], []
+    plan = explain["queryPlanner"]["winningPlan"]
+    # Newer servers wrap the classic plan under queryPlan
+    pending = [plan.get("queryPlan", plan)]
+    while pending:
+        plan = pending.pop()
+        stages.append(plan.get("stage"))
+        if plan.get("indexName") and plan["indexName"] not in index_names:
+            index_names.append(plan["indexName"])
+        children = ([plan["inputStage"]] if plan.get("inputStage") else []) + plan.get("inputStages", [])
+        pending.extend(reversed(children))
+    return {"stages": stages, "index": ",".join(index_names) or None}
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from config import get_settings
+from database import get_db
+from services.versioning import stamp
+
+# ---------------------------
+# COMPANY CATALOG: DENORMALIZED QUESTION COUNTS + IN-PROCESS CACHE
+# ---------------------------
+
+_cache_lock = threading.Lock()
+_cache = {
+    "version": 0, "loaded_version": None, "expires_at": 0.0,
+    "companies": None, "etag": None, "last_modified": None
+}
+
+
+def invalidate_catalog():
+    """Drop this worker's cached catalog; other workers refresh within CATALOG_CACHE_TTL_SECONDS."""
+    with _cache_lock:
+        _cache["version"] += 1
+
+
+def bump_question_counts(db, company_id: str, counts_by_type: dict):
+    """
+    Atomically add (or, with negative numbers, subtract) questions to a
+    company's question_count and question_counts.<interview_type> counters.
+    """
+    inc = {f"question_counts.{interview_type}": n for interview_type, n in counts_by_type.items() if n}
+    if not inc:
+        return
+    inc["question_count"] = sum(inc.values())
+    db.companies.update_one({"id": company_id}, stamp({"$inc": inc}))
+    invalidate_catalog()
+
+
+def recount_question_counts(db, company_ids: list):
+    """Recompute the counters of the given companies from company_questions."""
+    counts = {company_id: Counter() for company_id in company_ids}
+    for row in db.company_questions.aggregate([
+        {"$match": {"company_id": {"$in": list(company_ids)}}},
+        {"$group": {"_id": {"company_id": "$company_id", "interview_type": "$interview_type"}, "count": {"$sum": 1}}}
+    ]):
+        counts[row["_id"]["company_id"]][row["_id"]["interview_type"]] = row["count"]
+
+    for company_id, by_type in counts.items():
+        db.companies.update_one({"id": company_id}, stamp({"$set": {
+            "question_counts": dict(by_type),
+            "question_count": sum(by_type.values())
+        }}))
+    return counts
+
+
+def get_catalog() -> tuple:
+    """
+    Return (companies, etag, last_modified) for GET /companies.
+
+    Served from the in-process cache while it is fresh; otherwise one
+    name-ordered read of companies, with counters backfilled for companies
+    stored before they existed.
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        if _cache["loaded_version"] == _cache["version"] and now < _cache["expires_at"]:
+            return _cache["companies"], _cache["etag"], _cache["last_modified"]
+        version = _cache["version"]
+        previous_etag, previous_modified = _cache["etag"], _cache["last_modified"]
+
+    with get_db() as db:
+        companies = list(db.companies.find({}, {"_id": 0}).sort("name", 1))
+        missing = [c["id"] for c in companies if "question_count" not in c]
+        if missing:
+            recounted = recount_question_counts(db, missing)
+            for company in companies:
+                if company["id"] in recounted:
+                    by_type = recounted[company["id"]]
+                    company["question_counts"] = dict(by_type)
+                    company["question_count"] = sum(by_type.values())
+
+    for company in companies:
+        company.setdefault("question_counts", {})
+
+    etag = '"' + hashlib.sha1(json.dumps(companies, sort_keys=True, default=str).encode("utf-8")).hexdigest() + '"'
+    timestamps = [c.get("updated_at") or c.get("created_at") for c in companies]
+    last_modified = max((t for t in timestamps if t), default=None)
+    if previous_etag and etag != previous_etag and previous_modified and (last_modified is None or last_modified <= previous_modified):
+        # A deleted company changes the catalog without a newer timestamp
+        last_modified = datetime.utcnow()
+
+    with _cache_lock:
+        # Skip storing if the catalog changed while we were reading it
+        if _cache["version"] == version:
+            _cache.update({
+                "loaded_version": version,
+                "expires_at": now + get_settings().catalog_cache_ttl_seconds,
+                "companies": companies,
+                "etag": etag,
+                "last_modified": last_modified
+            })
+    return companies, etag, last_modified
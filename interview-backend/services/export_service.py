@@ -5,11 +5,11 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from io import BytesIO
 from datetime import datetime
+from functools import lru_cache
 
-def generate_pdf_report(session_data: dict, answers_data: list) -> bytes:
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-
+@lru_cache(maxsize=1)
+def _report_styles() -> tuple:
+    """Report paragraph styles, built once per process."""
     styles = getSampleStyleSheet()
     title_style = ParagraphStyle(
         'CustomTitle',
@@ -27,13 +27,22 @@ def generate_pdf_report(session_data: dict, answers_data: list) -> bytes:
         spaceAfter=12,
         spaceBefore=20
     )
-    normal_style = styles['Normal']
+    return title_style, heading_style, styles['Normal']
+
+def generate_pdf_report(session_data: dict, answers_data: list) -> bytes:
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+
+    title_style, heading_style, normal_style = _report_styles()
+    questions = {q['id']: q['text'] for q in session_data.get('questions', [])}
+    # The interview's own date, so the same session always renders the same report
+    report_date = session_data.get('completed_at') or session_data.get('created_at') or datetime.now()
 
     story = []
 
     story.append(Paragraph("Interview Results Report", title_style))
     story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph(f"<b>Date:</b> {datetime.now().strftime('%B %d, %Y')}", normal_style))
+    story.append(Paragraph(f"<b>Date:</b> {report_date.strftime('%B %d, %Y')}", normal_style))
     story.append(Paragraph(f"<b>Duration:</b> {session_data['duration_seconds'] // 60} minutes", normal_style))
     story.append(Spacer(1, 0.3*inch))
 
@@ -47,10 +56,7 @@ def generate_pdf_report(session_data: dict, answers_data: list) -> bytes:
 
         story.append(Paragraph(f"Question {idx}", heading_style))
 
-        question_text = next(
-            (q['text'] for q in session_data.get('questions', []) if q['id'] == answer['question_id']),
-            "Question not found"
-        )
+        question_text = questions.get(answer['question_id'], "Question not found")
         story.append(Paragraph(f"<b>Q:</b> {question_text}", normal_style))
         story.append(Spacer(1, 0.2*inch))
 
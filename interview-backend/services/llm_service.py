@@ -3,6 +3,7 @@ import logging
 from groq import Groq
 from config import get_settings, get_settingsgpt
 from openai import OpenAI
+from services.usage_ledger import tracked_call, tracked_stream
 
 
 # ---------------------------
@@ -22,7 +23,8 @@ def get_clientgpt():
     settingsgpt = get_settingsgpt()
     if not settingsgpt.openai_api_key:
         raise ValueError("OPENAI_API_KEY is required. Please set it in your .env file.")
-    return OpenAI(api_key=settingsgpt.openai_api_key)
+    # Retries are handled (and counted) by usage_ledger.tracked_call
+    return OpenAI(api_key=settingsgpt.openai_api_key, max_retries=0)
 
 
 # ---------------------------
@@ -39,32 +41,25 @@ def calculate_question_count(duration_seconds: int, seconds_per_question: int =
     return max(1, duration_seconds // seconds_per_question)
 
 
-def generate_questions(job_description: str, resume_text: str, duration_seconds: int, interview_type: str = "technical") -> list:
-    logger = logging.getLogger("backend.llm_service")
+def stub_questions(duration_seconds: int, interview_type: str) -> list:
+    """Fallback default question based on interview type, used without an API key."""
+    if interview_type == "hr":
+        default_question = "Tell me about yourself and why you're interested in this role."
+    else:
+        default_question = "Describe a project where you demonstrated problem-solving skills."
 
-    # 1. Decide number of questions based on duration
-    question_count = calculate_question_count(duration_seconds)
+    return [
+        {
+            "id": "q1",
+            "text": default_question,
+            "estimated_seconds": min(180, max(30, int(duration_seconds / 3)))
+        }
+    ]
 
-    # 2. Try initializing open ai client
-    try:
-        client = get_clientgpt()
-    except ValueError as e:
-        logger.warning(f"{e} Falling back to stub questions.")
-        # Fallback default based on interview type
-        if interview_type == "hr":
-            default_question = "Tell me about yourself and why you're interested in this role."
-        else:
-            default_question = "Describe a project where you demonstrated problem-solving skills."
-        
-        return [
-            {
-                "id": "q1",
-                "text": default_question,
-                "estimated_seconds": min(180, max(30, int(duration_seconds / 3)))
-            }
-        ]
-
-    # 3. System Prompt enforcing strict JSON + fixed number of questions + interview type
+
+def _question_prompts(job_description: str, resume_text: str, duration_seconds: int, interview_type: str, question_count: int):
+    """Build the (system, user) prompts for question generation."""
+    # System Prompt enforcing strict JSON + fixed number of questions + interview type
     interview_type_instructions = ""
     if interview_type == "technical":
         interview_type_instructions = """
@@ -100,7 +95,7 @@ RULES:
 - Do NOT include explanations. Output ONLY JSON.
 """
 
-    # 4. User prompt containing JD, resume, total time, and interview type
+    # User prompt containing JD, resume, total time, and interview type
     user_prompt = f"""
 Job Description:
 {job_description}
@@ -114,9 +109,32 @@ Interview Type: {interview_type.upper()}
 Generate exactly {question_count} structured {interview_type} interview questions that match the interview type requirements.
 """
 
-    # 5. Call Groq LLM
+    return system_prompt, user_prompt
+
+
+def generate_questions(job_description: str, resume_text: str, duration_seconds: int, interview_type: str = "technical") -> list:
+    logger = logging.getLogger("backend.llm_service")
+
+    # 1. Decide number of questions based on duration
+    question_count = calculate_question_count(duration_seconds)
+
+    # 2. Try initializing open ai client
     try:
-        response = client.chat.completions.create(
+        client = get_clientgpt()
+    except ValueError as e:
+        logger.warning(f"{e} Falling back to stub questions.")
+        return stub_questions(duration_seconds, interview_type)
+
+    # 3. Prompts enforcing strict JSON + fixed number of questions + interview type
+    system_prompt, user_prompt = _question_prompts(
+        job_description, resume_text, duration_seconds, interview_type, question_count
+    )
+
+    # 4. Call Groq LLM
+    try:
+        response = tracked_call(
+            "generate_questions",
+            client.chat.completions.create,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -130,7 +148,7 @@ Generate exactly {question_count} structured {interview_type} interview question
 
     content = response.choices[0].message.content.strip()
 
-    # 6. Parse JSON from Groq response
+    # 5. Parse JSON from Groq response
     try:
         result = json.loads(content)
         return result.get("questions", [])
@@ -146,6 +164,157 @@ Generate exactly {question_count} structured {interview_type} interview question
         return result.get("questions", [])
 
 
+class QuestionStreamParser:
+    """
+    Incrementally parse a streamed {"questions": [{...}, ...]} response,
+    returning each question object as soon as its closing brace arrives.
+    Text outside the outer object (e.g. ``` fences) is ignored.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.current = []
+
+    def feed(self, text: str) -> list:
+        completed = []
+        for ch in text:
+            if self.depth >= 2:
+                self.current.append(ch)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+                if self.depth == 2:
+                    self.current = ["{"]
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 1:
+                    try:
+                        completed.append(json.loads("".join(self.current)))
+                    except json.JSONDecodeError:
+                        pass
+                    self.current = []
+        return completed
+
+
+def stream_questions(job_description: str, resume_text: str, duration_seconds: int, interview_type: str = "technical"):
+    """
+    Streaming variant of generate_questions: yields each question dict as soon
+    as the model has finished writing it. IDs are renumbered q1, q2, ... in
+    arrival order and at most the expected number of questions is yielded.
+    """
+    logger = logging.getLogger("backend.llm_service")
+
+    question_count = calculate_question_count(duration_seconds)
+
+    try:
+        client = get_clientgpt()
+    except ValueError as e:
+        logger.warning(f"{e} Falling back to stub questions.")
+        yield from stub_questions(duration_seconds, interview_type)
+        return
+
+    system_prompt, user_prompt = _question_prompts(
+        job_description, resume_text, duration_seconds, interview_type, question_count
+    )
+
+    parser = QuestionStreamParser()
+    emitted = 0
+    stream = tracked_stream(
+        "generate_questions",
+        client.chat.completions.create,
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.7,
+        max_tokens=1500,
+    )
+
+    try:
+        for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            for question in parser.feed(chunk.choices[0].delta.content):
+                text = question.get("text") if isinstance(question, dict) else None
+                if not isinstance(text, str) or not text.strip():
+                    continue
+                emitted += 1
+                yield {
+                    "id": f"q{emitted}",
+                    "text": text.strip(),
+                    "estimated_seconds": question.get("estimated_seconds") or 90
+                }
+                if emitted >= question_count:
+                    return
+    finally:
+        stream.close()
+
+
+# ---------------------------
+# RESUME PROFILE
+# ---------------------------
+
+def summarize_resume(resume_text: str) -> dict:
+    """
+    Condense a raw resume into a structured profile used in place of the
+    full text in every downstream prompt.
+    """
+    client = get_clientgpt()
+
+    system_prompt = """
+You are an expert technical recruiter. Condense the candidate's resume into a compact structured profile.
+Produce ONLY valid JSON in this exact structure:
+{
+  "headline": "One line: current role / degree and main focus",
+  "skills": ["skill", "..."],
+  "experience": [
+    {"role": "Role", "organization": "Company", "duration": "2021-2023", "highlights": ["short highlight"]}
+  ],
+  "projects": [
+    {"name": "Project", "technologies": ["tech"], "summary": "One sentence on what was built and the outcome"}
+  ],
+  "education": ["Degree, Institution, Year"],
+  "achievements": ["short achievement"]
+}
+
+RULES:
+- Keep only facts stated in the resume. Do NOT invent details.
+- At most 25 skills, 5 experience entries, 5 projects, 3 highlights per experience.
+- Keep every string short. Omit contact details and personal information.
+- Do NOT include explanations. Output ONLY JSON.
+"""
+
+    response = tracked_call(
+        "resume_profile",
+        client.chat.completions.create,
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Resume:\n{resume_text}"}
+        ],
+        temperature=0.1,
+        max_tokens=1200,
+        response_format={"type": "json_object"},
+    )
+
+    content = response.choices[0].message.content.strip()
+    return _parse_json_content(content)
+
+
 # ---------------------------
 # GENERATE IDEAL REFERENCE ANSWERS
 # ---------------------------
@@ -196,7 +365,9 @@ Question:
 {question}
 """
 
-    response = client.chat.completions.create(
+    response = tracked_call(
+        "reference_answer",
+        client.chat.completions.create,
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": system_prompt},
@@ -213,10 +384,8 @@ Question:
 # ANSWER EVALUATION
 # ---------------------------
 
-def evaluate_answer(question: str, transcript: str, reference_answer: str, interview_type: str = "technical") -> dict:
-    client = get_clientgpt()
-
-    # Adapt evaluation criteria based on interview type
+def _evaluation_criteria(interview_type: str):
+    """Return (criteria, evaluator_role) for the given interview type."""
     if interview_type == "technical":
         evaluation_criteria = """
 - relevance: Does the answer directly address the technical question asked?
@@ -235,6 +404,27 @@ def evaluate_answer(question: str, transcript: str, reference_answer: str, inter
 - fit: Overall cultural fit, soft skills, and alignment with role requirements based on the answer quality.
 """
         evaluator_role = "expert HR interviewer"
+    return evaluation_criteria, evaluator_role
+
+
+def _parse_json_content(content: str):
+    """Parse a JSON model response, unwrapping ``` code fences if present."""
+    try:
+        return json.loads(content)
+
+    except json.JSONDecodeError:
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+        return json.loads(content)
+
+
+def evaluate_answer(question: str, transcript: str, reference_answer: str, interview_type: str = "technical") -> dict:
+    client = get_clientgpt()
+
+    # Adapt evaluation criteria based on interview type
+    evaluation_criteria, evaluator_role = _evaluation_criteria(interview_type)
 
     system_prompt = f"""
 You are an {evaluator_role}. Your job is to evaluate a candidate's response using a structured, consistent rubric.
@@ -288,7 +478,9 @@ Ideal Reference Answer:
 Score objectively. Penalize vague or incorrect answers.
 """
 
-    response = client.chat.completions.create(
+    response = tracked_call(
+        "evaluate_answer",
+        client.chat.completions.create,
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": system_prompt},
@@ -301,12 +493,188 @@ Score objectively. Penalize vague or incorrect answers.
     content = response.choices[0].message.content.strip()
 
     # Parse JSON safely
-    try:
-        return json.loads(content)
+    return _parse_json_content(content)
 
-    except json.JSONDecodeError:
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
-        return json.loads(content)
+
+# ---------------------------
+# BATCH ANSWER EVALUATION
+# ---------------------------
+
+RUBRIC_CATEGORIES = ("relevance", "accuracy", "depth", "clarity", "fit")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used for request sizing."""
+    return len(text or "") // 4 + 1
+
+
+def _batch_item_prompt(index: int, item: dict) -> str:
+    return f"""
+### Answer {index}
+Question: {item["question"]}
+
+Candidate Answer:
+{item["transcript"]}
+
+Ideal Reference Answer:
+{item["reference_answer"]}
+"""
+
+
+def split_into_batches(items: list, token_budget: int) -> list:
+    """
+    Greedily pack items into batches whose estimated prompt size stays within
+    token_budget. An item larger than the budget gets a batch of its own.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for item in items:
+        item_tokens = estimate_tokens(_batch_item_prompt(len(current) + 1, item))
+        if current and current_tokens + item_tokens > token_budget:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(item)
+        current_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def is_valid_evaluation(evaluation) -> bool:
+    """Check that an evaluation has all five 1-10 rubric scores and a numeric total."""
+    if not isinstance(evaluation, dict):
+        return False
+    scores = evaluation.get("scores")
+    if not isinstance(scores, dict):
+        return False
+    for category in RUBRIC_CATEGORIES:
+        value = scores.get(category)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 1 <= value <= 10:
+            return False
+    total = evaluation.get("total_score")
+    if isinstance(total, bool) or not isinstance(total, (int, float)):
+        return False
+    return isinstance(evaluation.get("feedback", []), list)
+
+
+def _evaluate_batch(items: list, interview_type: str) -> list:
+    """
+    Score one packed batch with a single call.
+    Returns a list aligned with items; entries that failed validation are None.
+    """
+    client = get_clientgpt()
+    evaluation_criteria, evaluator_role = _evaluation_criteria(interview_type)
+
+    system_prompt = f"""
+You are an {evaluator_role}. Your job is to evaluate several responses from one candidate using a structured, consistent rubric.
+Evaluate each answer independently of the others.
+
+Follow these rules STRICTLY:
+
+1. Assign each category a score from 1 to 10 (integers only).
+2. Base scores ONLY on the candidate's actual text. Do NOT infer missing details.
+3. Do NOT give perfect scores unless the answer fully demonstrates excellence.
+4. Do NOT include any text outside the JSON. No explanations. No commentary.
+5. All output must be valid JSON. If you are unsure, return the closest valid JSON.
+
+Evaluation Criteria ({interview_type.upper()} Interview):
+
+{evaluation_criteria}
+
+Output Format (strict), exactly one entry per answer, in the order given:
+
+{{
+  "evaluations": [
+    {{
+      "index": int,
+      "scores": {{
+        "relevance": int,
+        "accuracy": int,
+        "depth": int,
+        "clarity": int,
+        "fit": int
+      }},
+      "total_score": float,
+      "feedback": [
+        "Short, specific point of improvement",
+        "Short, specific strength",
+        "Another short, specific note"
+      ],
+      "comparison_summary": "1–2 sentence comparison with an ideal expert-level answer."
+    }}
+  ]
+}}
+
+"index" is the number of the answer being scored.
+Compute total_score as the average of the five category scores, then scale it to a value between 1 and 10 (rounded to one decimal place).
+
+Return ONLY this JSON. No other text.
+"""
+
+    user_prompt = "".join(_batch_item_prompt(idx, item) for idx, item in enumerate(items, 1))
+    user_prompt += f"""
+Evaluate all {len(items)} answers. Score objectively. Penalize vague or incorrect answers.
+"""
+
+    response = tracked_call(
+        "evaluate_batch",
+        client.chat.completions.create,
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.2,
+        max_tokens=min(4000, 300 * len(items) + 200),
+        response_format={"type": "json_object"},
+    )
+
+    content = response.choices[0].message.content.strip()
+    evaluations = _parse_json_content(content).get("evaluations", [])
+
+    results = [None] * len(items)
+    for position, evaluation in enumerate(evaluations):
+        if not isinstance(evaluation, dict):
+            continue
+        index = evaluation.get("index", position + 1)
+        if isinstance(index, bool) or not isinstance(index, int) or not 1 <= index <= len(items):
+            continue
+        if is_valid_evaluation(evaluation):
+            results[index - 1] = evaluation
+    return results
+
+
+def evaluate_answers_batch(items: list, interview_type: str = "technical", token_budget: int = None) -> list:
+    """
+    Evaluate many answers with as few LLM calls as possible.
+
+    items: dicts with "question", "transcript" and "reference_answer".
+    Returns one evaluation per item, in order, shaped like evaluate_answer's
+    result. Items are split into batches by token_budget; any answer whose
+    batched result is missing or invalid is re-scored with evaluate_answer.
+    """
+    logger = logging.getLogger("backend.llm_service")
+
+    if token_budget is None:
+        token_budget = get_settings().batch_eval_token_budget
+
+    results = []
+    for batch in split_into_batches(items, token_budget):
+        try:
+            batch_results = _evaluate_batch(batch, interview_type)
+        except Exception as e:
+            logger.warning(f"Batch evaluation failed, falling back to per-answer calls: {e}")
+            batch_results = [None] * len(batch)
+
+        for item, evaluation in zip(batch, batch_results):
+            if evaluation is None:
+                evaluation = evaluate_answer(
+                    item["question"],
+                    item["transcript"],
+                    item["reference_answer"],
+                    interview_type
+                )
+            results.append(evaluation)
+    return results
@@ -7,7 +7,9 @@ from typing import List, Dict, Any
 from PIL import Image
 import fitz  # PyMuPDF - converts PDF to images without Poppler
 from openai import OpenAI
-from config import get_settingsgpt
+from config import get_settings, get_settingsgpt
+from services.usage_ledger import tracked_call
+from services.question_dedupe import dedupe_texts
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,8 @@ class OCRProcessor:
             settings = get_settingsgpt()
             if not settings.openai_api_key:
                 raise ValueError("OPENAI_API_KEY is required. Please set it in your .env file.")
-            self.client = OpenAI(api_key=settings.openai_api_key)
+            # Retries are handled (and counted) by usage_ledger.tracked_call
+            self.client = OpenAI(api_key=settings.openai_api_key, max_retries=0)
             self.debug_mode = False
             logger.info("OCR Processor initialized with GPT-4o-mini Vision")
         except Exception as e:
@@ -188,7 +191,9 @@ Return the questions in the exact JSON format specified. Extract every question
             ]
 
             # Call GPT-4o-mini Vision API
-            response = self.client.chat.completions.create(
+            response = tracked_call(
+                "ocr",
+                self.client.chat.completions.create,
                 model="gpt-4o-mini",
                 messages=messages,
                 temperature=0.1,  # Low temperature for accuracy
@@ -336,6 +341,14 @@ Return the questions in the exact JSON format specified. Extract every question
                 normalized = self._normalize_question(q)
                 if self._validate_question(normalized):
                     normalized_questions.append(normalized)
+
+            # Overlapping page chunks can extract the same question twice
+            duplicates = []
+            if get_settings().question_dedupe_enabled:
+                normalized_questions, duplicates = dedupe_texts(
+                    normalized_questions,
+                    lambda q: q["text"] + " " + " ".join(q["options"])
+                )
             
             # Format output to match expected structure
             result = {
@@ -343,6 +356,8 @@ Return the questions in the exact JSON format specified. Extract every question
                 "questions": normalized_questions,
                 "total_extracted": len(questions),
                 "total_valid": len(normalized_questions),
+                "duplicates_removed": len(duplicates),
+                "duplicates": duplicates,
                 "error": None if normalized_questions else "No valid questions found"
             }
             
@@ -356,5 +371,7 @@ Return the questions in the exact JSON format specified. Extract every question
                 "questions": [],
                 "error": str(e),
                 "total_extracted": 0,
-                "total_valid": 0
+                "total_valid": 0,
+                "duplicates_removed": 0,
+                "duplicates": []
             }
@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(values: dict) -> str:
+    """Opaque cursor for keyset pagination (datetimes kept as ISO strings)."""
+    payload = {
+        key: {"$date": value.isoformat()} if isinstance(value, datetime) else value
+        for key, value in values.items()
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, fields: dict = None) -> dict:
+    """
+    Inverse of encode_cursor; raises ValueError for a malformed cursor.
+    With fields ({key: type or tuple of types}), the cursor must hold exactly
+    those keys with values of those types.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(payload, dict):
+            raise ValueError("cursor is not an object")
+        after = {
+            key: datetime.fromisoformat(value["$date"]) if isinstance(value, dict) and "$date" in value else value
+            for key, value in payload.items()
+        }
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if fields is not None:
+        if set(after) != set(fields):
+            raise ValueError("Cursor does not match the sort order")
+        for key, types in fields.items():
+            if isinstance(after[key], bool) or not isinstance(after[key], types):
+                raise ValueError("Invalid cursor")
+    return after
+
+
+def parse_fields(fields: str, allowed: tuple, required: tuple = ("id",)) -> dict:
+    """
+    Projection for a comma-separated fields parameter, limited to allowed
+    fields (all of them when empty). Required fields are always included;
+    raises ValueError for unknown fields.
+    """
+    requested = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    selected = set(requested or allowed) | set(required)
+    return {"_id": 0, **{field: 1 for field in selected}}
@@ -1,9 +1,50 @@
-from PyPDF2 import PdfReader
-from io import BytesIO
+import hashlib
+import threading
+from collections import OrderedDict
+import fitz  # PyMuPDF
+from config import get_settings
+
+# Extracted text keyed by SHA-256 of the PDF, most recently used last
+_text_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _extract(pdf_bytes: bytes, max_pages: int, max_chars: int) -> str:
+    parts = []
+    total_chars = 0
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page_num in range(min(len(doc), max_pages)):
+            text = doc[page_num].get_text("text")
+            parts.append(text)
+            total_chars += len(text) + 1
+            if total_chars >= max_chars:
+                break
+    return "\n".join(parts).strip()[:max_chars]
+
 
 def extract_text_from_pdf(pdf_bytes: bytes) -> str:
-    reader = PdfReader(BytesIO(pdf_bytes))
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text.strip()
+    """
+    Extract plain text from a PDF with PyMuPDF.
+
+    Only the first PDF_MAX_PAGES pages are read and the result is capped at
+    PDF_MAX_CHARS characters. Results are cached by SHA-256 of the PDF, so a
+    repeated resume is not parsed again. Blocking: call it from a worker
+    thread (asyncio.to_thread) inside async handlers.
+    """
+    settings = get_settings()
+    key = hashlib.sha256(pdf_bytes).hexdigest()
+
+    with _cache_lock:
+        if key in _text_cache:
+            _text_cache.move_to_end(key)
+            return _text_cache[key]
+
+    text = _extract(pdf_bytes, settings.pdf_max_pages, settings.pdf_max_chars)
+
+    with _cache_lock:
+        _text_cache[key] = text
+        _text_cache.move_to_end(key)
+        while len(_text_cache) > settings.pdf_text_cache_size:
+            _text_cache.popitem(last=False)
+
+    return text
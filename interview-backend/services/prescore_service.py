@@ -0,0 +1,131 @@
+import re
+import threading
+from config import get_settings
+
+# ---------------------------
+# LOCAL PRE-SCORING OF LOW-CONTENT ANSWERS
+# ---------------------------
+
+# Only pure hesitation sounds: words like "like", "so" or "you know" also
+# carry content, and counting them let short real answers skip the LLM
+FILLER_WORDS = {
+    "um", "umm", "uh", "uhh", "uhm", "erm", "er", "ah", "hmm", "hm", "mm", "mhm",
+}
+
+DONT_KNOW_PATTERN = re.compile(
+    r"\b(i\s+(do\s*n[o']?t|dont)\s+know|no\s+idea|not\s+sure|can'?t\s+(answer|remember))\b"
+)
+
+DONT_KNOW_WORDS = {"don't", "dont", "not", "no", "sure", "idea", "can't", "cant", "answer", "remember", "sorry"}
+
+STOP_WORDS = {
+    "a", "an", "the", "and", "or", "but", "is", "are", "was", "were", "be", "to", "of",
+    "in", "on", "at", "for", "with", "about", "it", "this", "that", "your", "you", "me",
+    "my", "i", "we", "how", "what", "why", "when", "where", "which", "who", "do", "does",
+    "did", "can", "could", "would", "should", "tell", "describe", "explain",
+}
+
+CANNED_FEEDBACK = {
+    "empty": [
+        "No answer was captured for this question.",
+        "Make sure to speak clearly and give a complete response.",
+    ],
+    "dont_know": [
+        "The answer did not attempt to address the question.",
+        "Even when unsure, walk through how you would approach the problem.",
+    ],
+    "filler": [
+        "The answer consisted mostly of filler words with little content.",
+        "Pause to collect your thoughts, then give a structured response.",
+    ],
+    "too_short": [
+        "The answer was too short to demonstrate any understanding.",
+        "Expand with concrete examples, reasoning and outcomes.",
+    ],
+    "restated_question": [
+        "The answer mostly repeated the question without adding new information.",
+        "Answer the question directly and support it with specifics.",
+    ],
+}
+
+# LLM calls avoided per pre-scored answer: reference answer + evaluation
+CALLS_PER_ANSWER = 2
+
+_stats_lock = threading.Lock()
+_stats = {"prescored_answers": 0, "llm_calls_saved": 0}
+
+
+def _tokenize(text: str) -> list:
+    return re.findall(r"[a-z0-9']+", (text or "").lower())
+
+
+def classify_transcript(question: str, transcript: str):
+    """
+    Classify a transcript as low-content using only local heuristics.
+
+    Returns the reason ("empty", "dont_know", "filler", "too_short",
+    "restated_question") or None when the answer should go to the LLM.
+    """
+    settings = get_settings()
+    tokens = _tokenize(transcript)
+
+    if not tokens:
+        return "empty"
+
+    content = [t for t in tokens if t not in STOP_WORDS and t not in FILLER_WORDS]
+
+    # "I don't know" with (almost) nothing else said
+    if DONT_KNOW_PATTERN.search(" ".join(tokens)):
+        substantive = [t for t in content if t not in DONT_KNOW_WORDS]
+        if len(substantive) < settings.prescore_min_tokens:
+            return "dont_know"
+
+    filler_count = sum(1 for t in tokens if t in FILLER_WORDS)
+    if filler_count / len(tokens) >= settings.prescore_max_filler_ratio:
+        return "filler"
+
+    if len(tokens) < settings.prescore_min_tokens:
+        return "too_short"
+
+    if len(tokens) <= settings.prescore_short_answer_tokens:
+        question_words = set(_tokenize(question))
+        overlap = sum(1 for t in content if t in question_words) / len(content) if content else 1.0
+        if overlap >= settings.prescore_max_question_overlap:
+            return "restated_question"
+
+    return None
+
+
+def prescore_answer(question: str, transcript: str):
+    """
+    Score a low-content answer locally without calling the LLM.
+
+    Returns an evaluation shaped like llm_service.evaluate_answer's result
+    (plus "prescored" and "prescore_reason"), or None if the answer needs a
+    full evaluation. Every hit is counted in prescore_stats().
+    """
+    if not get_settings().prescore_enabled:
+        return None
+
+    reason = classify_transcript(question, transcript)
+    if reason is None:
+        return None
+
+    with _stats_lock:
+        _stats["prescored_answers"] += 1
+        _stats["llm_calls_saved"] += CALLS_PER_ANSWER
+
+    return {
+        "scores": {"relevance": 1, "accuracy": 1, "depth": 1, "clarity": 1, "fit": 1},
+        "total_score": 1.0,
+        "feedback": CANNED_FEEDBACK[reason],
+        "comparison_summary": "The answer did not contain enough content to compare with an ideal answer.",
+        "prescored": True,
+        "prescore_reason": reason,
+    }
+
+
+def prescore_stats() -> dict:
+    """Counts of answers pre-scored locally and LLM calls saved since startup."""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,154 @@
+import logging
+import uuid
+from datetime import datetime
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from config import get_settings
+from database import get_db
+from services.llm_service import calculate_question_count, generate_questions
+from services.question_bank_service import select_company_questions
+from services.question_pool_service import get_ready_pool, sample_pool_questions
+from services.usage_ledger import usage_scope
+from services.versioning import new_version
+
+logger = logging.getLogger("backend.provisioning_service")
+
+# Largest candidate list accepted by one provisioning job
+MAX_CANDIDATES = 5000
+
+
+def resolve_candidates(db, candidates: list) -> tuple:
+    """
+    Map a candidate list (user ids or emails) to user ids with one query.
+
+    Returns (user_ids, unknown), both in input order and without duplicates.
+    """
+    object_ids = [ObjectId(c) for c in candidates if ObjectId.is_valid(c)]
+    emails = [c.strip().lower() for c in candidates if not ObjectId.is_valid(c)]
+
+    found = {}
+    for user in db.users.find(
+        {"$or": [{"_id": {"$in": object_ids}}, {"email": {"$in": emails}}]},
+        {"_id": 1, "email": 1}
+    ):
+        found[str(user["_id"])] = str(user["_id"])
+        if user.get("email"):
+            found[user["email"].lower()] = str(user["_id"])
+
+    user_ids, unknown, seen = [], [], set()
+    for candidate in candidates:
+        user_id = found.get(candidate if ObjectId.is_valid(candidate) else candidate.strip().lower())
+        if user_id is None:
+            unknown.append(candidate)
+        elif user_id not in seen:
+            seen.add(user_id)
+            user_ids.append(user_id)
+    return user_ids, unknown
+
+
+def _drive_question_source(job: dict):
+    """
+    Resolve the drive's questions once and return a function giving each
+    candidate's question list.
+
+    Company drives use the company's questions; general drives sample from
+    the JD question pool (built on first use), or share one generated set
+    when no pool can be obtained.
+    """
+    if job["interview_mode"] == "company":
+        with get_db() as db:
+            questions = select_company_questions(db, job["company_id"], job["interview_type"], job["duration_seconds"])
+        return lambda: questions
+
+    question_count = calculate_question_count(job["duration_seconds"])
+    try:
+        pool = get_ready_pool(job["job_description"], job["interview_type"])
+    except Exception as e:
+        logger.warning(f"Question pool unavailable for provisioning job {job['id']}: {e}")
+        pool = None
+    if pool is not None:
+        return lambda: sample_pool_questions(pool, question_count)
+
+    questions = generate_questions(job["job_description"], "", job["duration_seconds"], job["interview_type"])
+    return lambda: questions
+
+
+def run_provisioning_job(job_id: str, user_ids: list):
+    """
+    Create one session per candidate for a provisioning job.
+
+    Questions are resolved once for the whole drive; sessions are built in
+    memory and written with insert_many in batches of PROVISIONING_BATCH_SIZE,
+    updating the job's progress after every batch.
+    """
+    batch_size = get_settings().provisioning_batch_size
+
+    with get_db() as db:
+        job = db.provisioning_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        return
+
+    try:
+        with usage_scope(company_id=job.get("company_id")):
+            next_questions = _drive_question_source(job)
+    except Exception as e:
+        logger.warning(f"Question resolution failed for provisioning job {job_id}: {e}")
+        with get_db() as db:
+            db.provisioning_jobs.update_one({"id": job_id}, {"$set": {
+                "status": "failed",
+                "error": str(e),
+                "finished_at": datetime.utcnow()
+            }})
+        return
+
+    with get_db() as db:
+        db.provisioning_jobs.update_one({"id": job_id}, {"$set": {"status": "inserting"}})
+
+    created = 0
+    try:
+        for start in range(0, len(user_ids), batch_size):
+            now = datetime.utcnow()
+            sessions = []
+            for user_id in user_ids[start:start + batch_size]:
+                session_data = {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "interview_mode": job["interview_mode"],
+                    "job_description": job["job_description"],
+                    "resume_text": "",
+                    "resume_profile_id": None,
+                    "duration_seconds": job["duration_seconds"],
+                    "interview_type": job["interview_type"],
+                    "questions": next_questions(),
+                    "status": "created",
+                    "final_score": None,
+                    "provisioning_job_id": job_id,
+                    "created_at": now,
+                    "completed_at": None,
+                    **new_version(now)
+                }
+                if job.get("company_id"):
+                    session_data["company_id"] = job["company_id"]
+                sessions.append(session_data)
+
+            with get_db() as db:
+                try:
+                    db.interview_sessions.insert_many(sessions, ordered=False)
+                    created += len(sessions)
+                except BulkWriteError as e:
+                    created += e.details.get("nInserted", 0)
+                    raise
+                finally:
+                    db.provisioning_jobs.update_one({"id": job_id}, {"$set": {"created": created}})
+
+        status, error = "completed", None
+    except Exception as e:
+        logger.warning(f"Provisioning job {job_id} failed after {created} sessions: {e}")
+        status, error = "failed", str(e)
+
+    with get_db() as db:
+        db.provisioning_jobs.update_one({"id": job_id}, {"$set": {
+            "status": status,
+            "error": error,
+            "finished_at": datetime.utcnow()
+        }})
@@ -0,0 +1,185 @@
+import random
+from config import get_settings
+from services.llm_service import calculate_question_count, stub_questions
+from services.question_index import get_company_index, terms
+from services.question_pool_service import jd_hash, sample_pool_questions
+
+# Ready pools considered when picking fallback questions for a JD
+FALLBACK_POOL_LIMIT = 20
+
+
+# Session order of difficulty strata; unknown difficulties go last
+DIFFICULTY_ORDER = ("easy", "medium", "hard")
+
+QUESTION_PROJECTION = {"_id": 0, "id": 1, "question_text": 1, "difficulty": 1}
+
+
+def format_company_questions(company_questions: list) -> list:
+    """Turn company_questions documents into session questions (q1, q2, ...)."""
+    return [
+        {"id": f"q{idx}", "text": q["question_text"], "estimated_seconds": 90, "source_id": q.get("id")}
+        for idx, q in enumerate(company_questions, 1)
+    ]
+
+
+def parse_difficulty_mix(value: str) -> dict:
+    """Parse a mix like "easy:1,medium:2,hard:1" into {difficulty: weight}."""
+    mix = {}
+    for part in (value or "").split(","):
+        name, _, weight = part.partition(":")
+        try:
+            if name.strip() and float(weight) > 0:
+                mix[name.strip().lower()] = float(weight)
+        except ValueError:
+            continue
+    return mix
+
+
+def allocate_quota(count: int, weights: dict, capacity: dict) -> dict:
+    """
+    Split count questions across strata in proportion to weights
+    (highest-averages method), never exceeding a stratum's capacity.
+    """
+    quota = {key: 0 for key in capacity}
+    for _ in range(min(count, sum(capacity.values()))):
+        open_strata = [key for key in capacity if quota[key] < capacity[key]]
+        weighted = [key for key in open_strata if weights.get(key, 0) > 0]
+        if weighted:
+            best = max(weighted, key=lambda key: weights[key] / (quota[key] + 1))
+        else:
+            # Weighted strata are exhausted; fill up from the others
+            best = max(open_strata, key=lambda key: capacity[key] - quota[key])
+        quota[best] += 1
+    return quota
+
+
+def seen_question_ids(db, user_id: str, company_id: str) -> list:
+    """Company question ids already asked to the user in earlier sessions."""
+    seen = set()
+    for session in db.interview_sessions.find(
+        {"user_id": user_id, "company_id": company_id},
+        {"_id": 0, "questions.source_id": 1}
+    ):
+        seen.update(q["source_id"] for q in session.get("questions", []) if q.get("source_id"))
+    return list(seen)
+
+
+def _sample_questions(db, match: dict, size: int, exclude_ids: list) -> list:
+    if size <= 0:
+        return []
+    if exclude_ids:
+        match = {**match, "id": {"$nin": exclude_ids}}
+    return list(db.company_questions.aggregate([
+        {"$match": match},
+        {"$sample": {"size": size}},
+        {"$project": QUESTION_PROJECTION}
+    ]))
+
+
+def select_company_questions(db, company_id: str, interview_type: str, duration_seconds: int, user_id: str = None, query_text: str = None) -> list:
+    """
+    Session questions for a company-based interview.
+
+    Picks question_count questions (90 seconds per question), stratified by
+    difficulty: in proportion to COMPANY_QUESTION_MIX when set, otherwise to
+    the bank's own mix. With query_text (JD and/or resume) and
+    COMPANY_QUESTION_RANKING on, each stratum takes the most relevant,
+    mutually diverse questions from the in-process TF-IDF index; otherwise
+    it is sampled in the database. Questions the user was asked in earlier
+    sessions of the company are avoided while unseen ones remain.
+    Returns [] when the company has no questions of this type.
+    """
+    question_count = calculate_question_count(duration_seconds)
+    match = {"company_id": company_id, "interview_type": interview_type}
+
+    available = {
+        row["_id"]: row["count"]
+        for row in db.company_questions.aggregate([
+            {"$match": match},
+            {"$group": {"_id": "$difficulty", "count": {"$sum": 1}}}
+        ])
+    }
+    if not available:
+        return []
+
+    mix = parse_difficulty_mix(get_settings().company_question_mix)
+    weights = {difficulty: mix.get(str(difficulty).lower(), 0) for difficulty in available} if mix else {}
+    if not any(weights.values()):
+        weights = dict(available)
+
+    seen = seen_question_ids(db, user_id, company_id) if user_id else []
+    quota = allocate_quota(question_count, weights, available)
+
+    selected = []
+    if query_text and query_text.strip() and get_settings().company_question_ranking:
+        index = get_company_index(db, company_id)
+        for difficulty, size in quota.items():
+            selected += index.rank(query_text, size, interview_type, difficulty, exclude_ids=seen)
+        if len(selected) < question_count and seen:
+            selected += index.rank(
+                query_text, question_count - len(selected), interview_type,
+                exclude_ids=[q["id"] for q in selected]
+            )
+    else:
+        for difficulty, size in quota.items():
+            selected += _sample_questions(db, {**match, "difficulty": difficulty}, size, seen)
+
+        # Not enough unseen questions: repeat previously asked ones rather than run short
+        if len(selected) < question_count and seen:
+            selected += _sample_questions(
+                db, match, question_count - len(selected), [q["id"] for q in selected]
+            )
+
+    rank = {difficulty: idx for idx, difficulty in enumerate(DIFFICULTY_ORDER)}
+    selected.sort(key=lambda q: rank.get(q.get("difficulty"), len(rank)))
+    return format_company_questions(selected)
+
+
+def keywords(text: str) -> set:
+    """Lower-cased content words of a text (technology names like c++ or node.js kept whole)."""
+    return set(terms(text))
+
+
+def fallback_questions(db, job_description: str, interview_type: str, duration_seconds: int) -> list:
+    """
+    Questions served from stored questions when LLM generation misses its deadline.
+
+    Uses the JD's own question pool when one is ready. Otherwise ranks other
+    pools' questions of the same interview type by keyword overlap with the
+    JD. Company question banks are never used, so one company's questions
+    do not reach unrelated sessions. Falls back to the stub question when no
+    pool is ready.
+    """
+    question_count = calculate_question_count(duration_seconds)
+
+    own_pool = db.question_pools.find_one(
+        {"jd_hash": jd_hash(job_description), "interview_type": interview_type, "status": "ready"},
+        {"_id": 0, "questions": 1}
+    )
+    if own_pool and own_pool.get("questions"):
+        return sample_pool_questions(own_pool, question_count)
+
+    candidates = []
+    for pool in (
+        db.question_pools
+        .find({"interview_type": interview_type, "status": "ready"}, {"_id": 0, "questions.text": 1})
+        .sort("ready_at", -1)
+        .limit(FALLBACK_POOL_LIMIT)
+    ):
+        candidates.extend(q["text"] for q in pool.get("questions", []))
+
+    if not candidates:
+        return stub_questions(duration_seconds, interview_type)
+
+    jd_words = keywords(job_description)
+    unique = {text.strip().lower(): text.strip() for text in candidates if text and text.strip()}
+    ranked = sorted(
+        unique.values(),
+        key=lambda text: (len(jd_words & keywords(text)), random.random()),
+        reverse=True
+    )
+
+    return [
+        {"id": f"q{idx}", "text": text, "estimated_seconds": 90}
+        for idx, text in enumerate(ranked[:question_count], 1)
+    ]
@@ -0,0 +1,206 @@
+import random
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from pymongo import UpdateOne
+from config import get_settings
+from services.prescore_service import STOP_WORDS
+
+# ---------------------------
+# MINHASH / LSH NEAR-DUPLICATE DETECTION FOR QUESTIONS
+# ---------------------------
+
+NUM_PERM = 64
+# LSH banding: two questions become candidates if any band of ROWS values matches
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are stored with the questions, so permutations must never change
+_seed = random.Random(20240601)
+_PERMUTATIONS = [(_seed.randrange(1, _PRIME), _seed.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# Per (company, interview type) indexes, built on first use and kept in sync
+# by the company routes; an HR question never duplicates a technical one
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def shingles(text: str) -> set:
+    """
+    Character shingles of the text's content words, lower-cased and joined
+    without spaces, so "hash map" / "hashmap" and dropped articles still match.
+    """
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    normalized = "".join(w for w in words if w not in STOP_WORDS) or "".join(words)
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text: str) -> list:
+    """MinHash signature (NUM_PERM ints) of a question text."""
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)]
+    if not hashes:
+        return [0] * NUM_PERM
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(signature_a: list, signature_b: list) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(signature_a, signature_b) if x == y) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of question signatures.
+
+    Lookups only compare against questions sharing at least one band, so
+    checking n new questions against a bank costs roughly O(n) instead of
+    comparing every pair.
+    """
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._signatures = {}
+        self._texts = {}
+        self._buckets = defaultdict(set)
+
+    def __len__(self):
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(signature: list):
+        for band in range(BANDS):
+            yield band, tuple(signature[band * ROWS:(band + 1) * ROWS])
+
+    def add(self, key: str, text: str, signature: list = None):
+        signature = signature or minhash(text)
+        with self._lock:
+            self._remove(key)
+            self._signatures[key] = signature
+            self._texts[key] = text
+            for band in self._bands(signature):
+                self._buckets[band].add(key)
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        self._texts.pop(key, None)
+        for band in self._bands(signature):
+            self._buckets[band].discard(key)
+            if not self._buckets[band]:
+                del self._buckets[band]
+
+    def find_duplicate(self, signature: list, threshold: float):
+        """Most similar stored question at or above threshold as {id, question_text, similarity}, or None."""
+        with self._lock:
+            candidates = set()
+            for band in self._bands(signature):
+                candidates.update(self._buckets.get(band, ()))
+
+            best, best_similarity = None, threshold
+            for key in candidates:
+                score = similarity(signature, self._signatures[key])
+                if score >= best_similarity:
+                    best, best_similarity = key, score
+
+            if best is None:
+                return None
+            return {"id": best, "question_text": self._texts[best], "similarity": round(best_similarity, 3)}
+
+
+def get_dedupe_index(db, company_id: str, interview_type: str) -> NearDuplicateIndex:
+    """
+    The near-duplicate index of a company's questions of one interview type,
+    built from the stored signatures on first use. Questions stored without
+    a signature get one written back.
+
+    Rebuilt after QUESTION_INDEX_TTL_SECONDS so inserts made through other
+    worker processes are picked up.
+    """
+    ttl = get_settings().question_index_ttl_seconds
+    key = (company_id, interview_type)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None and time.monotonic() - index.built_at < ttl:
+            return index
+
+    index = NearDuplicateIndex()
+    backfill = []
+    for question in db.company_questions.find(
+        {"company_id": company_id, "interview_type": interview_type},
+        {"_id": 0, "id": 1, "question_text": 1, "minhash": 1}
+    ):
+        signature = question.get("minhash")
+        if not signature or len(signature) != NUM_PERM:
+            signature = minhash(question.get("question_text", ""))
+            backfill.append(UpdateOne({"id": question["id"]}, {"$set": {"minhash": signature}}))
+        index.add(question["id"], question.get("question_text", ""), signature)
+
+    if backfill:
+        db.company_questions.bulk_write(backfill, ordered=False)
+
+    with _indexes_lock:
+        _indexes[key] = index
+    return index
+
+
+def dedupe_question_added(question: dict):
+    """Add a newly stored question to its company and type's index, if that index is loaded."""
+    with _indexes_lock:
+        index = _indexes.get((question["company_id"], question["interview_type"]))
+    if index is not None:
+        index.add(question["id"], question["question_text"], question.get("minhash"))
+
+
+def dedupe_question_removed(company_id: str, interview_type: str, question_id: str):
+    with _indexes_lock:
+        index = _indexes.get((company_id, interview_type))
+    if index is not None:
+        index.remove(question_id)
+
+
+def drop_dedupe_index(company_id: str):
+    """Drop every interview type's index of a company."""
+    with _indexes_lock:
+        for key in [k for k in _indexes if k[0] == company_id]:
+            del _indexes[key]
+
+
+def dedupe_texts(items: list, text_of, threshold: float = None) -> tuple:
+    """
+    Drop near-duplicates within a list (e.g. questions extracted from
+    overlapping OCR chunks), keeping the first occurrence.
+
+    Returns (kept_items, duplicates) where each duplicate is
+    {"index", "text", "duplicate_of_index", "similarity"}.
+    """
+    if threshold is None:
+        threshold = get_settings().question_dedupe_threshold
+    index = NearDuplicateIndex()
+    kept, duplicates = [], []
+    for position, item in enumerate(items):
+        text = text_of(item)
+        signature = minhash(text)
+        match = index.find_duplicate(signature, threshold)
+        if match:
+            duplicates.append({
+                "index": position,
+                "text": text,
+                "duplicate_of_index": int(match["id"]),
+                "similarity": match["similarity"]
+            })
+            continue
+        index.add(str(position), text, signature)
+        kept.append(item)
+    return kept, duplicates
@@ -0,0 +1,226 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from collections import Counter
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from config import get_settings
+from database import get_db
+from services.question_dedupe import drop_dedupe_index, get_dedupe_index, minhash
+from services.question_index import drop_company_index
+from services.company_catalog import bump_question_counts
+from services.question_bank_service import DIFFICULTY_ORDER
+
+logger = logging.getLogger("backend.question_import_service")
+
+MAX_QUESTION_CHARS = 2000
+# Row errors kept on the job document; all of them are counted
+MAX_REPORTED_ERRORS = 100
+DUPLICATE_KEY_ERROR = 11000
+
+
+def question_content_hash(company_id: str, interview_type: str, question_text: str) -> str:
+    """Hash identifying exact repeats of a question (case and whitespace insensitive)."""
+    normalized = re.sub(r"\s+", " ", question_text.strip().lower())
+    return hashlib.sha256(f"{company_id}\n{interview_type}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def backfill_content_hashes(db, company_id: str):
+    """Set content_hash on a company's questions stored before it existed."""
+    updates = [
+        UpdateOne(
+            {"id": q["id"]},
+            {"$set": {"content_hash": question_content_hash(company_id, q.get("interview_type", "technical"), q.get("question_text", ""))}}
+        )
+        for q in db.company_questions.find(
+            {"company_id": company_id, "content_hash": {"$exists": False}},
+            {"_id": 0, "id": 1, "question_text": 1, "interview_type": 1}
+        )
+    ]
+    if updates:
+        try:
+            db.company_questions.bulk_write(updates, ordered=False)
+        except BulkWriteError:
+            # Exact repeats already in the bank keep no hash; the first copy is enough
+            pass
+
+
+def iter_rows(path: str, file_format: str):
+    """
+    Yield (line_number, row) from an NDJSON or CSV file without loading it whole.
+
+    NDJSON lines may be objects or plain strings; a row is None when the line
+    cannot be parsed.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = None
+            if isinstance(row, str):
+                row = {"question_text": row}
+            yield line_number, row if isinstance(row, dict) else None
+
+
+def validate_row(row, default_interview_type: str, default_difficulty: str):
+    """Return (question fields, None) for a valid row or (None, error message)."""
+    if row is None:
+        return None, "Invalid row format"
+
+    text = row.get("question_text") or row.get("question") or row.get("text")
+    if not isinstance(text, str) or not text.strip():
+        return None, "Missing question_text"
+    if len(text) > MAX_QUESTION_CHARS:
+        return None, f"question_text longer than {MAX_QUESTION_CHARS} characters"
+
+    interview_type = row.get("interview_type") or default_interview_type
+    if not isinstance(interview_type, str):
+        return None, "Invalid interview_type"
+    interview_type = interview_type.strip().lower()
+    if interview_type not in ["technical", "hr"]:
+        return None, f"Invalid interview_type '{interview_type}'"
+
+    difficulty = row.get("difficulty") or default_difficulty
+    if not isinstance(difficulty, str):
+        return None, "Invalid difficulty"
+    difficulty = difficulty.strip().lower()
+    if difficulty not in DIFFICULTY_ORDER:
+        return None, f"Invalid difficulty '{difficulty}'"
+
+    return {"question_text": text.strip(), "interview_type": interview_type, "difficulty": difficulty}, None
+
+
+def _insert_batch(db, batch: list) -> tuple:
+    """
+    insert_many(ordered=False); returns (inserted counts per interview_type,
+    exact duplicates, other errors).
+    """
+    write_errors = []
+    try:
+        db.company_questions.insert_many(batch, ordered=False)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+
+    failed = {err["index"] for err in write_errors}
+    inserted = Counter(q["interview_type"] for idx, q in enumerate(batch) if idx not in failed)
+    duplicates = sum(1 for err in write_errors if err.get("code") == DUPLICATE_KEY_ERROR)
+    others = [
+        {"question_text": batch[err["index"]]["question_text"][:200], "error": err.get("errmsg", "")}
+        for err in write_errors if err.get("code") != DUPLICATE_KEY_ERROR
+    ]
+    return inserted, duplicates, others
+
+
+def run_question_import(job_id: str, path: str):
+    """
+    Stream an uploaded NDJSON / CSV file into company_questions.
+
+    Rows are validated one by one and written with insert_many(ordered=False)
+    in batches of QUESTION_IMPORT_BATCH_SIZE. Exact repeats are rejected by the
+    unique (company_id, content_hash) index; with skip_near_duplicates the
+    MinHash index also skips reworded repeats. Progress counters are updated
+    after every batch.
+    """
+    settings = get_settings()
+    batch_size = settings.question_import_batch_size
+
+    with get_db() as db:
+        job = db.question_imports.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        return
+
+    company_id = job["company_id"]
+    counts = {"processed": 0, "inserted": 0, "duplicates": 0, "near_duplicates": 0, "invalid": 0, "failed": 0}
+    errors = []
+
+    def record_error(line, message, counter="invalid"):
+        counts[counter] += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line, "error": message})
+
+    def flush(db, batch):
+        if batch:
+            inserted, duplicates, failures = _insert_batch(db, batch)
+            bump_question_counts(db, company_id, inserted)
+            counts["inserted"] += sum(inserted.values())
+            counts["duplicates"] += duplicates
+            for failure in failures:
+                record_error(None, f"{failure['error']} ({failure['question_text']})", "failed")
+        db.question_imports.update_one({"id": job_id}, {"$set": {**counts, "errors": errors}})
+
+    try:
+        with get_db() as db:
+            db.question_imports.update_one({"id": job_id}, {"$set": {"status": "running"}})
+            backfill_content_hashes(db, company_id)
+            # One near-duplicate index per interview type, loaded when a row first needs it
+            dedupe_indexes = {}
+
+            batch = []
+            for line, row in iter_rows(path, job["format"]):
+                counts["processed"] += 1
+                fields, error = validate_row(row, job["interview_type"], job["difficulty"])
+                if error:
+                    record_error(line, error)
+                    continue
+
+                question = {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    **fields,
+                    "content_hash": question_content_hash(company_id, fields["interview_type"], fields["question_text"]),
+                    "created_by": job["created_by"],
+                    "created_at": datetime.utcnow()
+                }
+
+                if job.get("skip_near_duplicates"):
+                    if fields["interview_type"] not in dedupe_indexes:
+                        dedupe_indexes[fields["interview_type"]] = get_dedupe_index(db, company_id, fields["interview_type"])
+                    dedupe_index = dedupe_indexes[fields["interview_type"]]
+                    signature = minhash(fields["question_text"])
+                    if dedupe_index.find_duplicate(signature, settings.question_dedupe_threshold):
+                        counts["near_duplicates"] += 1
+                        continue
+                    question["minhash"] = signature
+                    dedupe_index.add(question["id"], fields["question_text"], signature)
+
+                batch.append(question)
+                if len(batch) >= batch_size:
+                    flush(db, batch)
+                    batch = []
+
+            flush(db, batch)
+        status, error_message = "completed", None
+    except Exception as e:
+        logger.warning(f"Question import {job_id} failed: {e}")
+        status, error_message = "failed", str(e)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        # Rebuilt lazily on next use rather than updated row by row
+        drop_company_index(company_id)
+        drop_dedupe_index(company_id)
+
+    with get_db() as db:
+        db.question_imports.update_one({"id": job_id}, {"$set": {
+            **counts,
+            "errors": errors,
+            "status": status,
+            "error": error_message,
+            "finished_at": datetime.utcnow()
+        }})
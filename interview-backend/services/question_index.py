@@ -0,0 +1,186 @@
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from config import get_settings
+from services.prescore_service import STOP_WORDS
+
+# ---------------------------
+# IN-PROCESS TF-IDF INDEX OVER COMPANY QUESTIONS
+# ---------------------------
+
+# Per-company indexes, built on first use and kept in sync by the company routes
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+# Questions re-ranked for diversity per pick (the rest are too irrelevant to matter)
+RERANK_CANDIDATES_PER_PICK = 10
+# rank() difficulty filter matching every question
+ANY_DIFFICULTY = object()
+
+
+# Short function words not in STOP_WORDS; other short tokens (go, ai, ml,
+# js, c#, ui, r) are technology names and are kept
+SHORT_STOP_WORDS = {
+    "am", "as", "by", "he", "if", "no", "ok", "so", "up", "us", "vs", "eg", "ie", "e.g", "i.e",
+}
+
+
+def terms(text: str) -> Counter:
+    """Term counts of a text (technology names like c++, c# or node.js kept whole)."""
+    tokens = (token.strip(".") for token in re.findall(r"[a-z][a-z0-9+#.]*", (text or "").lower()))
+    return Counter(token for token in tokens if token not in STOP_WORDS and token not in SHORT_STOP_WORDS)
+
+
+def _dot(a: dict, b: dict) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+class CompanyQuestionIndex:
+    """
+    Sparse TF-IDF vectors for one company's questions.
+
+    Questions are added and removed incrementally; document frequencies are
+    kept up to date on every change and the normalized vectors are recomputed
+    lazily on the next query.
+    """
+
+    def __init__(self, company_id: str):
+        self.company_id = company_id
+        self.built_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._docs = {}  # question id -> (question doc, term counts)
+        self._df = Counter()
+        self._vectors = None  # question id -> {term: weight}, unit length
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, question: dict):
+        with self._lock:
+            self._remove(question["id"])
+            counts = terms(question.get("question_text", ""))
+            doc = {key: question.get(key) for key in ("id", "question_text", "interview_type", "difficulty")}
+            self._docs[question["id"]] = (doc, counts)
+            self._df.update(counts.keys())
+            self._vectors = None
+
+    def remove(self, question_id: str):
+        with self._lock:
+            self._remove(question_id)
+
+    def _remove(self, question_id: str):
+        entry = self._docs.pop(question_id, None)
+        if entry is None:
+            return
+        for term in entry[1]:
+            self._df[term] -= 1
+            if self._df[term] <= 0:
+                del self._df[term]
+        self._vectors = None
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + len(self._docs)) / (1 + self._df.get(term, 0))) + 1
+
+    def _weights(self, counts: Counter) -> dict:
+        vector = {term: (1 + math.log(count)) * self._idf(term) for term, count in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {term: w / norm for term, w in vector.items()}
+
+    def _ensure_vectors(self) -> dict:
+        if self._vectors is None:
+            self._vectors = {qid: self._weights(counts) for qid, (_, counts) in self._docs.items()}
+        return self._vectors
+
+    def rank(self, query_text: str, size: int, interview_type: str, difficulty=ANY_DIFFICULTY, exclude_ids=(), diversity: float = None) -> list:
+        """
+        Top questions for a query (JD + resume text), with diversity.
+
+        Uses maximal marginal relevance: each pick maximizes
+        (1 - diversity) * relevance - diversity * similarity to questions
+        already picked, so near-identical questions are not chosen together.
+        Pass difficulty to restrict to one difficulty (None matches questions
+        without one). Returns question docs (id, question_text, interview_type,
+        difficulty), most relevant first.
+        """
+        if diversity is None:
+            diversity = get_settings().question_ranking_diversity
+        exclude_ids = set(exclude_ids)
+
+        with self._lock:
+            vectors = self._ensure_vectors()
+            query = self._weights(terms(query_text))
+            candidates = [
+                (doc, vectors[qid])
+                for qid, (doc, _) in self._docs.items()
+                if doc["interview_type"] == interview_type
+                and (difficulty is ANY_DIFFICULTY or doc["difficulty"] == difficulty)
+                and qid not in exclude_ids
+            ]
+
+        # Random tie-break so equally (ir)relevant questions still vary per session
+        scored = [(_dot(query, vector), random.random(), doc, vector) for doc, vector in candidates]
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        scored = scored[:max(size * RERANK_CANDIDATES_PER_PICK, 50)]
+
+        redundancy = [0.0] * len(scored)
+        selected = []
+        remaining = set(range(len(scored)))
+        while remaining and len(selected) < size:
+            best = max(remaining, key=lambda i: (1 - diversity) * scored[i][0] - diversity * redundancy[i])
+            remaining.discard(best)
+            picked = scored[best][3]
+            selected.append((scored[best][2], picked))
+            for i in remaining:
+                redundancy[i] = max(redundancy[i], _dot(scored[i][3], picked))
+
+        return [doc for doc, _ in selected]
+
+
+def get_company_index(db, company_id: str) -> CompanyQuestionIndex:
+    """
+    The company's question index, built from the database on first use.
+
+    Rebuilt after QUESTION_INDEX_TTL_SECONDS so changes made through other
+    worker processes are picked up.
+    """
+    ttl = get_settings().question_index_ttl_seconds
+    with _indexes_lock:
+        index = _indexes.get(company_id)
+        if index is not None and time.monotonic() - index.built_at < ttl:
+            return index
+
+    index = CompanyQuestionIndex(company_id)
+    for question in db.company_questions.find(
+        {"company_id": company_id},
+        {"_id": 0, "id": 1, "question_text": 1, "interview_type": 1, "difficulty": 1}
+    ):
+        index.add(question)
+
+    with _indexes_lock:
+        _indexes[company_id] = index
+    return index
+
+
+def index_question_added(question: dict):
+    """Add a newly stored question to its company's index, if that index is loaded."""
+    with _indexes_lock:
+        index = _indexes.get(question["company_id"])
+    if index is not None:
+        index.add(question)
+
+
+def index_question_removed(company_id: str, question_id: str):
+    with _indexes_lock:
+        index = _indexes.get(company_id)
+    if index is not None:
+        index.remove(question_id)
+
+
+def drop_company_index(company_id: str):
+    with _indexes_lock:
+        _indexes.pop(company_id, None)
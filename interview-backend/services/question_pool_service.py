@@ -0,0 +1,193 @@
+import hashlib
+import logging
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from config import get_settings
+from database import get_db
+from services.llm_service import calculate_question_count, generate_questions, stub_questions
+
+logger = logging.getLogger("backend.question_pool_service")
+
+# Questions requested per generation call while filling a pool
+POOL_BATCH_SIZE = 15
+# How long a session waits for a pool another request is building
+POOL_WAIT_SECONDS = 60
+# A "building" pool older than this is assumed abandoned (e.g. worker restart)
+POOL_BUILD_TIMEOUT = timedelta(minutes=10)
+# Share of the requested size a pool needs to be stored as ready
+MIN_POOL_FRACTION = 0.5
+# A "failed" pool is rebuilt by the next session after this long
+POOL_RETRY_AFTER = timedelta(minutes=5)
+
+
+def jd_hash(job_description: str) -> str:
+    """Hash of the whitespace/case-normalized job description."""
+    normalized = re.sub(r"\s+", " ", (job_description or "").strip().lower())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _generate_pool_questions(job_description: str, interview_type: str, pool_size: int) -> list:
+    """
+    Fill a pool with JD-only questions in a few generation calls, skipping
+    repeats and the stub question served without an API key.
+    """
+    questions = []
+    seen = {_normalize_text(q["text"]) for q in stub_questions(90, interview_type)}
+    attempts = 0
+    while len(questions) < pool_size and attempts < pool_size // POOL_BATCH_SIZE + 2:
+        attempts += 1
+        batch = min(POOL_BATCH_SIZE, pool_size - len(questions))
+        for q in generate_questions(job_description, "", batch * 90, interview_type):
+            text = (q.get("text") or "").strip()
+            key = _normalize_text(text)
+            if not text or key in seen:
+                continue
+            seen.add(key)
+            questions.append({"text": text, "estimated_seconds": q.get("estimated_seconds") or 90})
+    return questions[:pool_size]
+
+
+def build_question_pool(job_description: str, interview_type: str, pool_size: int = None, rebuild: bool = False) -> dict:
+    """
+    Generate (or regenerate) the question pool for a JD and interview type.
+
+    Only one request builds a given pool: the builder claims it by inserting a
+    "building" document under the unique (jd_hash, interview_type) index.
+    Returns the pool document, or the existing one if another request owns it.
+    A pool with fewer than MIN_POOL_FRACTION of pool_size generated questions
+    (e.g. no API key or a failing provider) is stored as "failed" instead of
+    "ready" and rebuilt after POOL_RETRY_AFTER.
+    """
+    if pool_size is None:
+        pool_size = get_settings().question_pool_size
+    key = {"jd_hash": jd_hash(job_description), "interview_type": interview_type}
+
+    with get_db() as db:
+        db.question_pools.delete_one({
+            **key,
+            "status": "building",
+            "created_at": {"$lt": datetime.utcnow() - POOL_BUILD_TIMEOUT}
+        })
+        db.question_pools.delete_one({
+            **key,
+            "status": "failed",
+            "failed_at": {"$lt": datetime.utcnow() - POOL_RETRY_AFTER}
+        })
+        if rebuild:
+            db.question_pools.delete_one({**key, "status": {"$ne": "building"}})
+        try:
+            db.question_pools.insert_one({
+                "id": str(uuid.uuid4()),
+                **key,
+                "job_description": job_description,
+                "status": "building",
+                "questions": [],
+                "created_at": datetime.utcnow()
+            })
+        except DuplicateKeyError:
+            pool = db.question_pools.find_one(key)
+            pool.pop("_id", None)
+            return pool
+
+    try:
+        questions = _generate_pool_questions(job_description, interview_type, pool_size)
+    except Exception as e:
+        with get_db() as db:
+            db.question_pools.update_one({**key, "status": "building"}, {"$set": {
+                "status": "failed",
+                "error": str(e),
+                "failed_at": datetime.utcnow()
+            }})
+        raise
+
+    with get_db() as db:
+        if len(questions) < max(1, int(pool_size * MIN_POOL_FRACTION)):
+            logger.warning(f"Question pool got {len(questions)} of {pool_size} questions, not storing it as ready")
+            db.question_pools.update_one(key, {"$set": {
+                "status": "failed",
+                "error": f"Only {len(questions)} of {pool_size} questions generated",
+                "size": len(questions),
+                "failed_at": datetime.utcnow()
+            }})
+        else:
+            db.question_pools.update_one(key, {"$set": {
+                "status": "ready",
+                "questions": questions,
+                "size": len(questions),
+                "ready_at": datetime.utcnow()
+            }})
+        pool = db.question_pools.find_one(key)
+        pool.pop("_id", None)
+    return pool
+
+
+def get_ready_pool(job_description: str, interview_type: str):
+    """
+    Return the ready pool for a JD, building it if it does not exist yet and
+    waiting (up to POOL_WAIT_SECONDS) if another request is building it.
+    Returns None if no usable pool could be obtained.
+    """
+    key = {"jd_hash": jd_hash(job_description), "interview_type": interview_type}
+
+    with get_db() as db:
+        pool = db.question_pools.find_one(key, {"_id": 0})
+    retry_failed = pool and pool.get("status") == "failed" and pool["failed_at"] < datetime.utcnow() - POOL_RETRY_AFTER
+    if pool is None or retry_failed:
+        pool = build_question_pool(job_description, interview_type)
+
+    deadline = time.monotonic() + POOL_WAIT_SECONDS
+    while pool and pool.get("status") == "building" and time.monotonic() < deadline:
+        time.sleep(0.5)
+        with get_db() as db:
+            pool = db.question_pools.find_one(key, {"_id": 0})
+
+    if not pool or pool.get("status") != "ready" or not pool.get("questions"):
+        return None
+    return pool
+
+
+def sample_pool_questions(pool: dict, count: int) -> list:
+    """Random sample of up to count questions from a ready pool, numbered q1, q2, ..."""
+    selected = random.sample(pool["questions"], min(count, len(pool["questions"])))
+    return [
+        {"id": f"q{idx}", "text": q["text"], "estimated_seconds": q.get("estimated_seconds") or 90}
+        for idx, q in enumerate(selected, 1)
+    ]
+
+
+def select_session_questions(job_description: str, resume_text: str, duration_seconds: int, interview_type: str) -> list:
+    """
+    Pick a session's questions from the JD question pool.
+
+    Draws a random sample from the pool and, if QUESTION_POOL_RESUME_QUESTIONS
+    is set, tops it up with that many resume-specific generated questions.
+    Falls back to generating all questions when no pool is available.
+    """
+    settings = get_settings()
+    question_count = calculate_question_count(duration_seconds)
+
+    try:
+        pool = get_ready_pool(job_description, interview_type)
+    except Exception as e:
+        logger.warning(f"Question pool unavailable, generating per session: {e}")
+        pool = None
+    if pool is None:
+        return generate_questions(job_description, resume_text, duration_seconds, interview_type)
+
+    resume_count = min(settings.question_pool_resume_questions, question_count) if resume_text else 0
+    selected = sample_pool_questions(pool, question_count - resume_count)
+    if resume_count:
+        selected += generate_questions(job_description, resume_text, resume_count * 90, interview_type)[:resume_count]
+
+    return [
+        {"id": f"q{idx}", "text": q["text"], "estimated_seconds": q.get("estimated_seconds") or 90}
+        for idx, q in enumerate(selected, 1)
+    ]
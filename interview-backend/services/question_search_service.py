@@ -0,0 +1,65 @@
+from datetime import datetime
+from database import get_db
+from services.pagination import encode_cursor, decode_cursor
+
+SEARCHABLE_FIELDS = ("id", "company_id", "question_text", "interview_type", "difficulty", "created_by", "created_at")
+
+
+def search_questions(query: str = None, filters: dict = None, projection: dict = None, limit: int = 20, cursor: str = None) -> dict:
+    """
+    Search company_questions across companies.
+
+    With a query, matches go through the question_text text index and are
+    ranked by relevance (textScore); without one, questions are listed
+    newest first. filters holds equality filters (company_id, interview_type,
+    difficulty). Pagination is keyset-based: pass the returned next_cursor
+    to get the following page. Raises ValueError for a malformed cursor.
+    """
+    match = {key: value for key, value in (filters or {}).items() if value is not None}
+    projection = projection or {"_id": 0, **{field: 1 for field in SEARCHABLE_FIELDS}}
+    if query:
+        after = decode_cursor(cursor, {"score": (int, float), "id": str}) if cursor else None
+        pipeline = [
+            # $text must be in the first stage so the text index is used
+            {"$match": {**match, "$text": {"$search": query}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+        ]
+        if after:
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": after["score"]}},
+                {"score": after["score"], "id": {"$gt": after["id"]}}
+            ]}})
+        pipeline += [
+            {"$sort": {"score": -1, "id": 1}},
+            {"$limit": limit + 1},
+            {"$project": {**projection, "score": 1}},
+        ]
+        with get_db() as db:
+            items = list(db.company_questions.aggregate(pipeline))
+        sort_keys = ("score", "id")
+    else:
+        after = decode_cursor(cursor, {"created_at": datetime, "id": str}) if cursor else None
+        if after:
+            match["$or"] = [
+                {"created_at": {"$lt": after["created_at"]}},
+                {"created_at": after["created_at"], "id": {"$lt": after["id"]}}
+            ]
+        with get_db() as db:
+            items = list(
+                db.company_questions
+                .find(match, {**projection, "created_at": 1})
+                .sort([("created_at", -1), ("id", -1)])
+                .limit(limit + 1)
+            )
+        sort_keys = ("created_at", "id")
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor({key: items[-1].get(key) for key in sort_keys})
+
+    if "created_at" not in projection:
+        for item in items:
+            item.pop("created_at", None)
+
+    return {"questions": items, "next_cursor": next_cursor}
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from config import get_settings
+from database import get_db
+from services.export_service import generate_pdf_report
+
+logger = logging.getLogger("backend.report_service")
+
+# ---------------------------
+# PDF REPORTS: PROCESS-POOL RENDERING, VERSIONED BYTE CACHE, ZIP EXPORT
+# ---------------------------
+
+# Only what generate_pdf_report reads, so the version changes exactly when the report would
+REPORT_SESSION_PROJECTION = {
+    "_id": 0, "id": 1, "user_id": 1, "job_description": 1, "duration_seconds": 1,
+    "questions": 1, "created_at": 1, "completed_at": 1
+}
+REPORT_ANSWER_PROJECTION = {
+    "_id": 0, "question_id": 1, "transcript": 1, "score": 1, "feedback": 1, "model_answer": 1
+}
+# Sessions a single zip export may contain
+MAX_EXPORT_SESSIONS = 500
+
+_pool = None
+_pool_lock = threading.Lock()
+
+_cache = OrderedDict()  # (session id, version) -> pdf bytes
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _render_pool():
+    """
+    Process pool for reportlab rendering, created on first use (None = render in a thread).
+
+    Workers are spawned, not forked: by first use this process holds a
+    MongoClient with monitor threads and open sockets, which pymongo does
+    not support carrying across fork. generate_pdf_report lives in
+    export_service, which imports no database or API clients.
+    """
+    global _pool
+    workers = get_settings().pdf_render_workers
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_render_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def load_report_data(db, session_id: str, user_id: str = None):
+    """(session, answers) needed to render a report, or (None, None) if the session does not exist."""
+    query = {"id": session_id}
+    if user_id is not None:
+        query["user_id"] = user_id
+    session = db.interview_sessions.find_one(query, REPORT_SESSION_PROJECTION)
+    if not session:
+        return None, None
+    answers = list(db.interview_answers.find({"session_id": session_id}, REPORT_ANSWER_PROJECTION))
+    return session, answers
+
+
+def report_version(session: dict, answers: list) -> str:
+    """Hash of everything the report shows; changes whenever an answer is (re)scored."""
+    payload = json.dumps([session, answers], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key):
+    with _cache_lock:
+        pdf = _cache.get(key)
+        if pdf is not None:
+            _cache.move_to_end(key)
+        return pdf
+
+
+def _cache_put(key, pdf: bytes):
+    global _cache_bytes
+    limit = get_settings().pdf_report_cache_mb * 1024 * 1024
+    if len(pdf) > limit:
+        return
+    with _cache_lock:
+        if key in _cache:
+            return
+        # Older versions of the same session can never be served again
+        for stale in [k for k in _cache if k[0] == key[0]]:
+            _cache_bytes -= len(_cache.pop(stale))
+        _cache[key] = pdf
+        _cache_bytes += len(pdf)
+        while _cache_bytes > limit:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+async def render_report(session: dict, answers: list) -> tuple:
+    """
+    Return (pdf bytes, version) for a session, from the cache when this
+    version was rendered before; otherwise rendered in the process pool so
+    the event loop keeps serving other requests.
+    """
+    version = report_version(session, answers)
+    key = (session["id"], version)
+    pdf = _cache_get(key)
+    if pdf is None:
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(_render_pool(), generate_pdf_report, session, answers)
+        _cache_put(key, pdf)
+    return pdf, version
+
+
+class ZipStream:
+    """Write-only, unseekable file object collecting what ZipFile writes."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def _load_and_render(session_id: str) -> bytes:
+    def load():
+        with get_db() as db:
+            return load_report_data(db, session_id)
+
+    session, answers = await asyncio.to_thread(load)
+    if session is None:
+        return None
+    pdf, _ = await render_report(session, answers)
+    return pdf
+
+
+async def stream_reports_zip(entries: list):
+    """
+    Async generator of a zip archive holding one PDF report per entry
+    ({"session_id", "filename"}).
+
+    Up to twice the number of render workers reports are loaded and rendered
+    ahead, while finished ones are written out in order, so the download
+    starts with the first report instead of after the last.
+    """
+    window_size = max(get_settings().pdf_render_workers, 1) * 2
+    stream = ZipStream()
+    pending = deque()
+    remaining = iter(entries)
+
+    def schedule():
+        entry = next(remaining, None)
+        if entry is not None:
+            pending.append((entry, asyncio.create_task(_load_and_render(entry["session_id"]))))
+
+    try:
+        for _ in range(window_size):
+            schedule()
+
+        # PDFs are already compressed
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+            while pending:
+                entry, task = pending.popleft()
+                schedule()
+                try:
+                    pdf = await task
+                except Exception as e:
+                    logger.warning(f"Report export failed for {entry['session_id']}: {e}")
+                    pdf = None
+                if pdf is not None:
+                    archive.writestr(entry["filename"], pdf)
+                    yield stream.drain()
+        yield stream.drain()
+    finally:
+        # Client went away: stop rendering the rest
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,216 @@
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+from database import get_db
+from services.cohort_service import attach_students, build_cohort_query
+from services.llm_service import RUBRIC_CATEGORIES
+from services.report_service import ZipStream
+
+# ---------------------------
+# STREAMING CSV / XLSX RESULTS EXPORT (ONE ROW PER ANSWER)
+# ---------------------------
+
+EXPORT_COLUMNS = [
+    "student_name", "student_email", "user_id", "session_id", "company_id", "drive_id",
+    "interview_type", "status", "final_score", "created_at", "completed_at",
+    "question_number", "question_id", "question_text", "answer_score",
+    *RUBRIC_CATEGORIES, "feedback", "scoring_status"
+]
+# Sessions per users lookup (and per flushed chunk of rows)
+EXPORT_BATCH_SIZE = 200
+
+# Characters XML 1.0 does not allow, e.g. control codes from transcripts
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def results_pipeline(query: dict) -> list:
+    """One document per session with its questions and trimmed answers."""
+    return [
+        {"$match": query},
+        {"$sort": {"created_at": 1, "id": 1}},
+        {"$lookup": {"from": "interview_answers", "localField": "id", "foreignField": "session_id", "as": "answers"}},
+        {"$project": {
+            "_id": 0, "id": 1, "user_id": 1, "company_id": 1, "provisioning_job_id": 1, "interview_type": 1,
+            "status": 1, "final_score": 1, "created_at": 1, "completed_at": 1,
+            "questions": {"$map": {"input": {"$ifNull": ["$questions", []]}, "as": "q", "in": {"id": "$$q.id", "text": "$$q.text"}}},
+            "answers": {"$map": {"input": "$answers", "as": "a", "in": {
+                "question_id": "$$a.question_id",
+                "score": "$$a.score",
+                "category_scores": "$$a.category_scores",
+                "feedback": "$$a.feedback",
+                "scoring_status": "$$a.scoring_status"
+            }}}
+        }}
+    ]
+
+
+def _session_rows(session: dict):
+    """Rows (lists in EXPORT_COLUMNS order) for one session, in question order."""
+    base = [
+        session.get("student_name"), session.get("student_email"), session.get("user_id"), session["id"],
+        session.get("company_id"), session.get("provisioning_job_id"), session.get("interview_type"),
+        session.get("status"), session.get("final_score"), session.get("created_at"), session.get("completed_at")
+    ]
+    answers = {a.get("question_id"): a for a in session.get("answers", [])}
+    if not answers:
+        yield base + [None] * (len(EXPORT_COLUMNS) - len(base))
+        return
+
+    order = {q["id"]: idx for idx, q in enumerate(session.get("questions", []), 1)}
+    texts = {q["id"]: q.get("text") for q in session.get("questions", [])}
+    for question_id, answer in sorted(answers.items(), key=lambda item: order.get(item[0], len(order) + 1)):
+        categories = answer.get("category_scores") or {}
+        yield base + [
+            order.get(question_id), question_id, texts.get(question_id), answer.get("score"),
+            *(categories.get(category) for category in RUBRIC_CATEGORIES),
+            " | ".join(answer.get("feedback") or []), answer.get("scoring_status")
+        ]
+
+
+def iter_result_batches(filters: dict):
+    """
+    Lists of export rows, one list per EXPORT_BATCH_SIZE sessions, read from
+    a single aggregation cursor so memory stays flat however large the export.
+    """
+    query, _ = build_cohort_query(filters)
+    with get_db() as db:
+        cursor = db.interview_sessions.aggregate(results_pipeline(query), allowDiskUse=True, batchSize=EXPORT_BATCH_SIZE)
+        batch = []
+        for session in cursor:
+            batch.append(session)
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                attach_students(db, batch)
+                yield [row for s in batch for row in _session_rows(s)]
+                batch = []
+        if batch:
+            attach_students(db, batch)
+            yield [row for s in batch for row in _session_rows(s)]
+
+
+# Leading characters that make spreadsheet apps treat a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _neutralize_formula(value: str) -> str:
+    # Keep spreadsheet apps from evaluating answer text as a formula
+    return "'" + value if value[:1] in FORMULA_PREFIXES else value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str):
+        return _neutralize_formula(value)
+    return value
+
+
+def stream_results_csv(filters: dict):
+    """CSV export as encoded chunks, one per batch of sessions."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel detects UTF-8
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in iter_result_batches(filters):
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_cell(ref: str, value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        value = str(value)
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        value = value.isoformat(sep=" ", timespec="seconds")
+    elif isinstance(value, str):
+        # Inline strings are never evaluated, but the sheet may be re-saved as CSV
+        value = _neutralize_formula(value)
+    text = escape(_INVALID_XML_CHARS.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(number: int, values: list) -> str:
+    cells = "".join(_xlsx_cell(f"{_column_letter(i)}{number}", v) for i, v in enumerate(values))
+    return f'<row r="{number}">{cells}</row>'
+
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Results" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def stream_results_xlsx(filters: dict):
+    """
+    XLSX export as chunks. The workbook is written directly as its zip of
+    XML parts, with the worksheet streamed row by row (inline strings, no
+    shared-strings table), so no spreadsheet library or full in-memory
+    workbook is needed.
+    """
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + _xlsx_row(1, EXPORT_COLUMNS)
+            ).encode("utf-8"))
+            row_number = 1
+            for rows in iter_result_batches(filters):
+                chunk = []
+                for row in rows:
+                    row_number += 1
+                    chunk.append(_xlsx_row(row_number, row))
+                sheet.write("".join(chunk).encode("utf-8"))
+                yield stream.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield stream.drain()
@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import uuid
+from datetime import datetime
+from pymongo.errors import DuplicateKeyError
+from database import get_db
+from services.pdf_service import extract_text_from_pdf
+from services.llm_service import summarize_resume
+
+logger = logging.getLogger("backend.resume_profile_service")
+
+# Used when the resume cannot be summarized (no API key, provider error)
+FALLBACK_SUMMARY_CHARS = 4000
+
+
+def resume_hash(resume_bytes: bytes) -> str:
+    return hashlib.sha256(resume_bytes).hexdigest()
+
+
+def format_resume_profile(profile: dict) -> str:
+    """Render a structured resume profile as the compact text used in prompts."""
+    lines = []
+    if profile.get("headline"):
+        lines.append(profile["headline"])
+    if profile.get("skills"):
+        lines.append("Skills: " + ", ".join(profile["skills"]))
+
+    for exp in profile.get("experience") or []:
+        header = " - ".join(p for p in (exp.get("role"), exp.get("organization"), exp.get("duration")) if p)
+        highlights = "; ".join(exp.get("highlights") or [])
+        lines.append(f"Experience: {header}" + (f": {highlights}" if highlights else ""))
+
+    for project in profile.get("projects") or []:
+        tech = ", ".join(project.get("technologies") or [])
+        line = f"Project: {project.get('name', '')}"
+        if tech:
+            line += f" ({tech})"
+        if project.get("summary"):
+            line += f": {project['summary']}"
+        lines.append(line)
+
+    if profile.get("education"):
+        lines.append("Education: " + "; ".join(profile["education"]))
+    if profile.get("achievements"):
+        lines.append("Achievements: " + "; ".join(profile["achievements"]))
+
+    return "\n".join(lines)
+
+
+def get_or_create_resume_profile(user_id: str, resume_bytes: bytes) -> dict:
+    """
+    Return the user's resume profile for this exact resume, building it once.
+
+    Profiles are keyed by (user_id, SHA-256 of the PDF), so uploading the same
+    resume again costs a single indexed read instead of text extraction and
+    an LLM call.
+    """
+    content_hash = resume_hash(resume_bytes)
+
+    with get_db() as db:
+        existing = db.resume_profiles.find_one({"user_id": user_id, "content_hash": content_hash})
+        if existing:
+            existing.pop("_id", None)
+            return existing
+
+    resume_text = extract_text_from_pdf(resume_bytes)
+
+    try:
+        profile = summarize_resume(resume_text)
+        summary = format_resume_profile(profile)
+    except Exception as e:
+        logger.warning(f"Resume summarization failed, using truncated resume text: {e}")
+        profile = {}
+        summary = ""
+
+    if not summary:
+        # Not stored, so the next upload of this resume tries again
+        return {
+            "id": None,
+            "user_id": user_id,
+            "content_hash": content_hash,
+            "resume_text": resume_text,
+            "profile": {},
+            "summary": resume_text[:FALLBACK_SUMMARY_CHARS]
+        }
+
+    doc = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "content_hash": content_hash,
+        "resume_text": resume_text,
+        "profile": profile,
+        "summary": summary,
+        "created_at": datetime.utcnow()
+    }
+
+    with get_db() as db:
+        try:
+            db.resume_profiles.insert_one(doc)
+        except DuplicateKeyError:
+            # Built concurrently by another request; keep the stored one
+            doc = db.resume_profiles.find_one({"user_id": user_id, "content_hash": content_hash})
+        doc.pop("_id", None)
+
+    return doc
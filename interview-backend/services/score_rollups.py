@@ -0,0 +1,312 @@
+import logging
+from datetime import datetime
+from services.cohort_service import attach_students
+from services.llm_service import RUBRIC_CATEGORIES
+
+logger = logging.getLogger("backend.score_rollups")
+
+# ---------------------------
+# INCREMENTALLY MAINTAINED SCORE ROLLUPS (score_rollups)
+# ---------------------------
+#
+# One document per (scope, key, interview_type):
+#   scope "user" keyed by user_id, "company" by company_id, "drive" by
+#   provisioning_job_id and "global" (key "all") over every session;
+#   interview_type is "technical", "hr" or "all".
+# Each completed session adds its contribution with $inc, so a dashboard
+# reads a single document instead of aggregating raw sessions.
+#
+# Percentiles come from score_histogram, a count per 0.1-point score bucket.
+# Scores are bounded (0-10), so a fixed histogram is a compact, mergeable
+# quantile sketch that is exact at this resolution and, unlike t-digest or
+# KLL, supports removing a session's old score when it is re-analyzed.
+
+SCOPES = ("user", "company", "drive", "global")
+GLOBAL_KEY = "all"
+ALL_TYPES = "all"
+# Latest sessions kept per rollup for the trend
+RECENT_SESSIONS = 20
+TREND_WINDOW = 5
+MAX_SCORE = 10
+BUCKETS_PER_POINT = 10
+QUANTILES = (0.25, 0.5, 0.75, 0.9)
+# Stored with each contribution. Contributions without it were folded in
+# before score_histogram and the global scope existed, so neither holds them.
+ROLLUP_SCHEMA = 2
+
+
+def session_contribution(final_score: float, answers: list) -> dict:
+    """
+    What one completed session adds to its rollups: the final score and the
+    sums / counts of the per-category rubric scores of its scored answers.
+    """
+    category_sums = {category: 0.0 for category in RUBRIC_CATEGORIES}
+    category_counts = {category: 0 for category in RUBRIC_CATEGORIES}
+    for answer in answers:
+        for category, value in (answer.get("category_scores") or {}).items():
+            if category in category_sums:
+                category_sums[category] += value
+                category_counts[category] += 1
+    return {
+        "final_score": final_score,
+        "answers": sum(1 for a in answers if a.get("score") is not None),
+        "category_sums": category_sums,
+        "category_counts": category_counts,
+        "schema": ROLLUP_SCHEMA
+    }
+
+
+def _rollup_keys(session: dict) -> list:
+    keys = {
+        "user": session.get("user_id"),
+        "company": session.get("company_id"),
+        "drive": session.get("provisioning_job_id"),
+        "global": GLOBAL_KEY
+    }
+    interview_type = session.get("interview_type", "technical")
+    return [
+        {"scope": scope, "key": keys[scope], "interview_type": t}
+        for scope in SCOPES if keys[scope]
+        for t in (interview_type, ALL_TYPES)
+    ]
+
+
+def score_bucket(score: float) -> int:
+    return int(round(min(max(score or 0, 0), MAX_SCORE) * BUCKETS_PER_POINT))
+
+
+def percentile_rank(histogram: dict, score: float):
+    """
+    Percentage of sessions scoring below score, counting ties as half
+    ("83rd percentile"). None for an empty histogram.
+    """
+    histogram = {b: n for b, n in histogram.items() if n > 0}
+    total = sum(histogram.values())
+    if not total:
+        return None
+    bucket = score_bucket(score)
+    below = sum(n for b, n in histogram.items() if int(b) < bucket)
+    return round(100 * (below + 0.5 * histogram.get(str(bucket), 0)) / total, 1)
+
+
+def score_quantiles(histogram: dict) -> dict:
+    """QUANTILES of the histogrammed scores, e.g. {"p50": 6.4}."""
+    total = sum(histogram.values())
+    if not total:
+        return {}
+    quantiles, seen = {}, 0
+    pending = list(QUANTILES)
+    for bucket in sorted(histogram, key=int):
+        seen += histogram[bucket]
+        while pending and seen >= pending[0] * total:
+            quantiles[f"p{round(pending.pop(0) * 100)}"] = int(bucket) / BUCKETS_PER_POINT
+    return quantiles
+
+
+def _increments(contribution: dict, sign: int) -> dict:
+    inc = {
+        "sessions": sign,
+        "score_sum": sign * contribution["final_score"],
+        "score_sq_sum": sign * contribution["final_score"] ** 2,
+        "answers": sign * contribution["answers"]
+    }
+    if contribution.get("schema"):
+        inc[f"score_histogram.{score_bucket(contribution['final_score'])}"] = sign
+    for category in RUBRIC_CATEGORIES:
+        inc[f"category_sums.{category}"] = sign * contribution["category_sums"].get(category, 0)
+        inc[f"category_counts.{category}"] = sign * contribution["category_counts"].get(category, 0)
+    return inc
+
+
+def apply_session_rollup(db, session_id: str, contribution: dict):
+    """
+    Fold a completed session into its user / company / drive rollups.
+
+    The contribution last applied is stored on the session (rollup), so
+    re-analyzing a session replaces its earlier contribution instead of
+    counting it twice; the compare-and-set on that field makes concurrent
+    calls for the same session apply each change once. rollup_pending is
+    set with the claim and cleared once every rollup is written, so a
+    session whose writes failed part-way stays marked; it is left alone
+    here and repaired by backfill_rollups(rebuild=True).
+    """
+    session = db.interview_sessions.find_one(
+        {"id": session_id},
+        {"_id": 0, "id": 1, "user_id": 1, "company_id": 1, "provisioning_job_id": 1,
+         "interview_type": 1, "completed_at": 1, "rollup": 1, "rollup_pending": 1}
+    )
+    if not session:
+        return
+    if session.get("rollup_pending"):
+        logger.warning(f"Rollups of {session_id} are incomplete; skipped until a rebuild")
+        return
+
+    previous = session.get("rollup")
+    if previous == contribution:
+        return
+    claimed = db.interview_sessions.update_one(
+        {"id": session_id, "rollup": previous} if previous else {"id": session_id, "rollup": {"$exists": False}},
+        {"$set": {"rollup": contribution, "rollup_pending": True}}
+    )
+    if not claimed.modified_count:
+        # Another request changed this session's contribution first
+        return
+
+    inc = _increments(contribution, 1)
+    replace_inc = dict(inc)
+    if previous:
+        for field, value in _increments(previous, -1).items():
+            replace_inc[field] = replace_inc.get(field, 0) + value
+    legacy = previous and not previous.get("schema")
+
+    recent = {
+        "session_id": session_id,
+        "score": contribution["final_score"],
+        "completed_at": session.get("completed_at") or datetime.utcnow()
+    }
+    for rollup_key in _rollup_keys(session):
+        # A legacy contribution was never added to the global scope
+        counted = previous and not (legacy and rollup_key["scope"] == "global")
+        if counted:
+            db.score_rollups.update_one(rollup_key, {"$pull": {"recent": {"session_id": session_id}}})
+        db.score_rollups.update_one(
+            rollup_key,
+            {
+                "$inc": replace_inc if counted else inc,
+                "$push": {"recent": {"$each": [recent], "$sort": {"completed_at": 1}, "$slice": -RECENT_SESSIONS}},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+    db.interview_sessions.update_one({"id": session_id, "rollup": contribution}, {"$unset": {"rollup_pending": ""}})
+
+
+def record_session_rollup(db, session_id: str, final_score: float, answers: list):
+    """apply_session_rollup for analyze_session; a failure is logged, never raised."""
+    try:
+        apply_session_rollup(db, session_id, session_contribution(final_score, answers))
+    except Exception as e:
+        logger.warning(f"Score rollup update failed for {session_id}: {e}")
+
+
+def backfill_rollups(db, rebuild: bool = False) -> int:
+    """
+    Fold completed sessions that have no rollup contribution yet; returns how many.
+
+    With rebuild, all rollups and session contributions are dropped first
+    and every completed session is folded again, which also repairs
+    sessions left rollup_pending by a failed update and adds legacy
+    contributions to score_histogram and the global scope. Run it while no
+    sessions are being analyzed.
+    """
+    if rebuild:
+        db.score_rollups.delete_many({})
+        db.interview_sessions.update_many(
+            {"$or": [{"rollup": {"$exists": True}}, {"rollup_pending": {"$exists": True}}]},
+            {"$unset": {"rollup": "", "rollup_pending": ""}}
+        )
+
+    count = 0
+    for session in db.interview_sessions.find(
+        {"status": "completed", "rollup": {"$exists": False}},
+        {"_id": 0, "id": 1, "final_score": 1}
+    ):
+        answers = list(db.interview_answers.find(
+            {"session_id": session["id"], "score": {"$ne": None}},
+            {"_id": 0, "score": 1, "category_scores": 1}
+        ))
+        apply_session_rollup(db, session["id"], session_contribution(session.get("final_score") or 0, answers))
+        count += 1
+    return count
+
+
+def format_rollup(doc: dict) -> dict:
+    """Rollup document with averages, per-category means and the recent trend filled in."""
+    sessions = doc.get("sessions", 0)
+    score_sum = doc.get("score_sum", 0)
+    avg = score_sum / sessions if sessions else None
+    variance = doc.get("score_sq_sum", 0) / sessions - avg ** 2 if sessions else None
+
+    category_means = {}
+    for category in RUBRIC_CATEGORIES:
+        n = doc.get("category_counts", {}).get(category, 0)
+        if n:
+            category_means[category] = round(doc["category_sums"][category] / n, 2)
+
+    # Buckets emptied by re-analysis stay in the document with a zero count
+    histogram = {b: n for b, n in doc.get("score_histogram", {}).items() if n > 0}
+
+    recent = doc.get("recent", [])
+    latest = [r["score"] for r in recent[-TREND_WINDOW:]]
+    earlier = [r["score"] for r in recent[-2 * TREND_WINDOW:-TREND_WINDOW]]
+    trend = round(sum(latest) / len(latest) - sum(earlier) / len(earlier), 2) if latest and earlier else None
+
+    return {
+        "scope": doc["scope"],
+        "key": doc["key"],
+        "interview_type": doc["interview_type"],
+        "sessions": sessions,
+        "answers": doc.get("answers", 0),
+        "score_sum": round(score_sum, 2),
+        "avg_score": round(avg, 2) if avg is not None else None,
+        "score_stddev": round(max(variance, 0) ** 0.5, 2) if variance is not None else None,
+        "category_means": category_means,
+        "quantiles": score_quantiles(histogram),
+        "score_histogram": histogram,
+        "recent": recent,
+        # Mean of the latest TREND_WINDOW sessions minus the mean of the ones before
+        "trend": trend,
+        "updated_at": doc.get("updated_at")
+    }
+
+
+def get_rollup(db, scope: str, key: str, interview_type: str = ALL_TYPES):
+    doc = db.score_rollups.find_one({"scope": scope, "key": key, "interview_type": interview_type}, {"_id": 0})
+    return format_rollup(doc) if doc else None
+
+
+def leaderboard(db, scope: str, key: str, interview_type: str = ALL_TYPES, limit: int = 10) -> list:
+    """
+    Top candidates of a company or drive by best completed-session score,
+    one entry per user, each with its percentile from the rollup histogram.
+
+    Reads sessions in (final_score desc) index order until limit distinct
+    users are found, so the cost depends on limit, not on the cohort size.
+    """
+    field = {"company": "company_id", "drive": "provisioning_job_id"}[scope]
+    query = {field: key, "status": "completed", "final_score": {"$type": "number"}}
+    if interview_type != ALL_TYPES:
+        query["interview_type"] = interview_type
+
+    rollup = db.score_rollups.find_one(
+        {"scope": scope, "key": key, "interview_type": interview_type},
+        {"_id": 0, "score_histogram": 1}
+    ) or {}
+    histogram = rollup.get("score_histogram", {})
+
+    entries, seen_users = [], set()
+    cursor = (
+        db.interview_sessions
+        .find(query, {"_id": 0, "id": 1, "user_id": 1, "final_score": 1, "interview_type": 1, "completed_at": 1})
+        .sort([("final_score", -1), ("id", -1)])
+        .batch_size(limit * 2)
+    )
+    for session in cursor:
+        if session.get("user_id") in seen_users:
+            continue
+        seen_users.add(session.get("user_id"))
+        entries.append({
+            "rank": len(entries) + 1,
+            "user_id": session.get("user_id"),
+            "session_id": session["id"],
+            "interview_type": session.get("interview_type"),
+            "score": session["final_score"],
+            "percentile": percentile_rank(histogram, session["final_score"]),
+            "completed_at": session.get("completed_at")
+        })
+        if len(entries) >= limit:
+            break
+    cursor.close()
+
+    attach_students(db, entries)
+    return entries
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+from database import get_db
+from services.llm_service import RUBRIC_CATEGORIES, evaluate_answer, generate_reference_answer
+from services.prescore_service import prescore_answer
+from services.usage_ledger import usage_scope
+from services.versioning import stamp, touch_session
+
+logger = logging.getLogger("backend.scoring_service")
+
+# scoring_status values on interview_answers
+PENDING = "pending"
+SCORING = "scoring"
+# Claimed by analyze_session for inline scoring; background scoring leaves it alone
+ANALYZING = "analyzing"
+DONE = "done"
+FAILED = "failed"
+
+# Session statuses after which speculative work is pointless
+STOPPED_SESSION_STATUSES = ("abandoned", "completed")
+
+
+def get_reference_answer(session: dict, question_id: str, question_text: str) -> str:
+    """Return the precomputed reference answer for a question, generating it if missing."""
+    stored = (session.get("reference_answers") or {}).get(question_id)
+    if stored:
+        return stored
+    return generate_reference_answer(
+        question_text,
+        session.get("job_description", ""),
+        session.get("resume_text", ""),
+        session.get("interview_type", "technical")
+    )
+
+
+def category_scores(evaluation: dict):
+    """The evaluation's numeric per-category rubric scores, or None if it has none."""
+    scores = evaluation.get("scores")
+    if not isinstance(scores, dict):
+        return None
+    valid = {
+        category: scores[category]
+        for category in RUBRIC_CATEGORIES
+        if isinstance(scores.get(category), (int, float)) and not isinstance(scores.get(category), bool)
+    }
+    return valid or None
+
+
+def prescored_fields(session: dict, question_id: str, evaluation: dict) -> dict:
+    """Answer fields to store for a locally pre-scored answer."""
+    return {
+        "score": evaluation["total_score"],
+        "category_scores": category_scores(evaluation),
+        "feedback": evaluation["feedback"],
+        "model_answer": (session.get("reference_answers") or {}).get(question_id),
+        "prescore_reason": evaluation["prescore_reason"],
+        "scoring_status": DONE
+    }
+
+
+def precompute_reference_answers(session_id: str):
+    """
+    Generate and store reference answers for every question of a new session
+    while the candidate is answering.
+
+    Stops as soon as the session is abandoned or completed, and skips
+    questions that already have a stored answer.
+    """
+    with usage_scope(session_id=session_id) as usage_links:
+        with get_db() as db:
+            session = db.interview_sessions.find_one({"id": session_id})
+        if not session:
+            return
+        if session.get("company_id"):
+            usage_links["company_id"] = session["company_id"]
+
+        for question in session.get("questions", []):
+            with get_db() as db:
+                current = db.interview_sessions.find_one(
+                    {"id": session_id},
+                    {"status": 1, "reference_answers": 1}
+                )
+            if not current or current.get("status") in STOPPED_SESSION_STATUSES:
+                logger.info(f"Stopped reference precomputation for session {session_id}")
+                return
+            if (current.get("reference_answers") or {}).get(question["id"]):
+                continue
+
+            try:
+                reference_answer = generate_reference_answer(
+                    question.get("text", ""),
+                    session.get("job_description", ""),
+                    session.get("resume_text", ""),
+                    session.get("interview_type", "technical")
+                )
+            except Exception as e:
+                logger.warning(f"Reference precomputation failed for {session_id}/{question['id']}: {e}")
+                return
+
+            with get_db() as db:
+                db.interview_sessions.update_one(
+                    {"id": session_id},
+                    {"$set": {f"reference_answers.{question['id']}": reference_answer}}
+                )
+
+
+def score_answer(session_id: str, question_id: str, transcript: str):
+    """
+    Score a single uploaded answer as soon as its transcript is stored.
+
+    Runs as a background task after upload-answer. The answer is claimed
+    (pending -> scoring) before the LLM call and the result is only written
+    while it still holds that claim and the transcript that was scored, so
+    neither a re-recorded answer nor one analyze_session took over is
+    overwritten with a stale score.
+    """
+    with usage_scope(session_id=session_id) as usage_links:
+        try:
+            with get_db() as db:
+                session = db.interview_sessions.find_one({"id": session_id})
+                if not session:
+                    return
+                if session.get("company_id"):
+                    usage_links["company_id"] = session["company_id"]
+
+                question_text = next(
+                    (q.get("text", "") for q in session.get("questions", []) if q["id"] == question_id),
+                    None
+                )
+                if not question_text:
+                    return
+
+                match = {"session_id": session_id, "question_id": question_id, "transcript": transcript}
+
+                prescored = prescore_answer(question_text, transcript)
+                if prescored:
+                    result = db.interview_answers.update_one(
+                        {**match, "scoring_status": PENDING},
+                        stamp({"$set": prescored_fields(session, question_id, prescored)})
+                    )
+                    if result.modified_count:
+                        touch_session(db, session_id)
+                    return
+
+                result = db.interview_answers.update_one(
+                    {**match, "scoring_status": PENDING},
+                    stamp({"$set": {"scoring_status": SCORING}})
+                )
+                if not result.modified_count:
+                    # Re-recorded, or already claimed by analyze_session
+                    return
+                touch_session(db, session_id)
+
+            interview_type = session.get("interview_type", "technical")
+            reference_answer = get_reference_answer(session, question_id, question_text)
+            evaluation = evaluate_answer(question_text, transcript, reference_answer, interview_type)
+
+            score = evaluation.get("total_score") or evaluation.get("score") or 0
+
+            with get_db() as db:
+                result = db.interview_answers.update_one({**match, "scoring_status": SCORING}, stamp({"$set": {
+                    "score": score,
+                    "category_scores": category_scores(evaluation),
+                    "feedback": evaluation.get("feedback", []),
+                    "model_answer": reference_answer,
+                    "scoring_status": DONE
+                }}))
+                if result.modified_count:
+                    touch_session(db, session_id)
+
+        except Exception as e:
+            logger.warning(f"Incremental scoring failed for {session_id}/{question_id}: {e}")
+            with get_db() as db:
+                result = db.interview_answers.update_one(
+                    {
+                        "session_id": session_id, "question_id": question_id, "transcript": transcript,
+                        "scoring_status": {"$in": [PENDING, SCORING]}
+                    },
+                    stamp({"$set": {"scoring_status": FAILED}})
+                )
+                if result.modified_count:
+                    touch_session(db, session_id)
+
+
+async def wait_for_pending_scores(session_id: str, timeout_seconds: float, poll_interval: float = 0.5):
+    """Wait until no answer of the session is still queued or being scored, or the timeout passes."""
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        with get_db() as db:
+            in_flight = db.interview_answers.count_documents({
+                "session_id": session_id,
+                "scoring_status": {"$in": [PENDING, SCORING]}
+            })
+        if not in_flight or time.monotonic() >= deadline:
+            return in_flight
+        await asyncio.sleep(poll_interval)
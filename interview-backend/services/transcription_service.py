@@ -3,13 +3,15 @@ from openai import OpenAI
 from typing import Union, BinaryIO
 from fastapi import UploadFile
 from config import get_settingsgpt
+from services.usage_ledger import tracked_call
 
 def get_clientgpt():
     """Lazy initialization of OpenAI client."""
     settingsgpt = get_settingsgpt()
     if not settingsgpt.openai_api_key:
         raise ValueError("OPENAI_API_KEY is required. Please set it in your .env file.")
-    return OpenAI(api_key=settingsgpt.openai_api_key)
+    # Retries are handled (and counted) by usage_ledger.tracked_call
+    return OpenAI(api_key=settingsgpt.openai_api_key, max_retries=0)
 
 # Initialize OpenAI client (reads OPENAI_API_KEY automatically)
 client = get_clientgpt()
@@ -43,7 +45,9 @@ def transcribe_audio(audio_source: Union[str, BinaryIO, UploadFile]) -> str:
 
     try:
         # Perform transcription - force English output regardless of detected language
-        response = client.audio.transcriptions.create(
+        response = tracked_call(
+            "transcription",
+            client.audio.transcriptions.create,
             model="gpt-4o-mini-transcribe",  # newer, faster Whisper model
             file=audio_file,
             language="en",  # force transcription language to English
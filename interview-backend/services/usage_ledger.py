@@ -0,0 +1,227 @@
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+import openai
+from database import get_db
+
+logger = logging.getLogger("backend.usage_ledger")
+
+# Links (session_id, company_id, upload_id) attached to every ledger entry
+# recorded inside the current usage_scope.
+_scope: ContextVar = ContextVar("llm_usage_scope", default={})
+
+# Transient provider errors worth retrying; clients are built with max_retries=0,
+# so this covers everything the SDK would otherwise retry itself
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError, openai.APITimeoutError, openai.ConflictError,
+    openai.RateLimitError, openai.InternalServerError
+)
+# Retryable statuses without a dedicated exception class (408 Request Timeout)
+RETRYABLE_STATUS_CODES = (408,)
+MAX_RETRIES = 2
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS_CODES
+
+
+@contextmanager
+def usage_scope(**links):
+    """
+    Attach links to all LLM / transcription calls made inside the block.
+
+    Yields the link dict so callers can add links that become known later,
+    e.g. company_id once the session has been loaded.
+    """
+    merged = {**_scope.get(), **{k: v for k, v in links.items() if v is not None}}
+    token = _scope.set(merged)
+    try:
+        yield merged
+    finally:
+        _scope.reset(token)
+
+
+def _usage_numbers(response) -> dict:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or getattr(usage, "input_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or getattr(usage, "output_tokens", 0) or 0,
+        "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details else 0,
+    }
+
+
+def _record(entry: dict):
+    try:
+        with get_db() as db:
+            db.llm_usage.insert_one(entry)
+    except Exception as e:
+        # The ledger must never break the call it is measuring
+        logger.warning(f"Failed to record LLM usage: {e}")
+
+
+def tracked_call(operation: str, fn, **kwargs):
+    """
+    Call an OpenAI SDK method (fn(**kwargs)) and record it in the llm_usage ledger.
+
+    Transient errors are retried up to MAX_RETRIES times with backoff; the
+    ledger entry holds the model, token usage, total latency and retry count.
+    """
+    started = time.perf_counter()
+    retries = 0
+    response = None
+    error = None
+
+    while True:
+        try:
+            response = fn(**kwargs)
+            break
+        except Exception as e:
+            if not is_retryable(e) or retries >= MAX_RETRIES:
+                error = e
+                break
+            retries += 1
+            time.sleep(0.5 * 2 ** (retries - 1))
+            # Rewind file uploads (transcription) so the retry sends the whole file
+            if hasattr(kwargs.get("file"), "seek"):
+                kwargs["file"].seek(0)
+
+    entry = {
+        "id": str(uuid.uuid4()),
+        **_scope.get(),
+        "operation": operation,
+        "model": kwargs.get("model"),
+        **_usage_numbers(response),
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "retries": retries,
+        "success": error is None,
+        "created_at": datetime.utcnow()
+    }
+    _record(entry)
+
+    if error is not None:
+        raise error
+    return response
+
+
+def tracked_stream(operation: str, fn, **kwargs):
+    """
+    Streaming variant of tracked_call: yields the chunks of fn(stream=True, **kwargs)
+    and records one ledger entry once the stream is exhausted or closed.
+
+    Streams carry no usage block, so token counts are estimated (prompt from
+    the message text, completion from the number of content chunks) and the
+    entry is flagged as estimated.
+    """
+    started = time.perf_counter()
+    retries = 0
+    completion_chunks = 0
+    error = None
+
+    while True:
+        try:
+            stream = fn(stream=True, **kwargs)
+            break
+        except Exception as e:
+            if not is_retryable(e) or retries >= MAX_RETRIES:
+                error = e
+                break
+            retries += 1
+            time.sleep(0.5 * 2 ** (retries - 1))
+
+    try:
+        if error is None:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    completion_chunks += 1
+                yield chunk
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+        _record({
+            "id": str(uuid.uuid4()),
+            **_scope.get(),
+            "operation": operation,
+            "model": kwargs.get("model"),
+            "prompt_tokens": prompt_chars // 4 + 1,
+            "completion_tokens": completion_chunks,
+            "cached_tokens": 0,
+            "estimated": True,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "retries": retries,
+            "success": error is None,
+            "created_at": datetime.utcnow()
+        })
+
+    if error is not None:
+        raise error
+
+
+# ---------------------------
+# AGGREGATES
+# ---------------------------
+
+_TOTALS = {
+    "calls": {"$sum": 1},
+    "prompt_tokens": {"$sum": "$prompt_tokens"},
+    "completion_tokens": {"$sum": "$completion_tokens"},
+    "cached_tokens": {"$sum": "$cached_tokens"},
+    "latency_ms": {"$sum": "$latency_ms"},
+    "retries": {"$sum": "$retries"},
+    "failures": {"$sum": {"$cond": ["$success", 0, 1]}},
+}
+
+
+def _summarize(match: dict) -> dict:
+    with get_db() as db:
+        by_operation = list(db.llm_usage.aggregate([
+            {"$match": match},
+            {"$group": {"_id": "$operation", **_TOTALS}},
+            {"$sort": {"_id": 1}}
+        ]))
+
+    totals = {key: 0 for key in _TOTALS}
+    for row in by_operation:
+        row["operation"] = row.pop("_id")
+        for key in _TOTALS:
+            totals[key] += row[key]
+    totals["latency_ms"] = round(totals["latency_ms"], 1)
+
+    return {"totals": totals, "by_operation": by_operation}
+
+
+def session_usage(session_id: str) -> dict:
+    return _summarize({"session_id": session_id})
+
+
+def upload_usage(upload_id: str) -> dict:
+    return _summarize({"upload_id": upload_id})
+
+
+def company_usage(company_id: str) -> dict:
+    return _summarize({"company_id": company_id})
+
+
+def daily_usage(days: int = 30) -> list:
+    since = datetime.utcnow() - timedelta(days=days)
+    with get_db() as db:
+        rows = list(db.llm_usage.aggregate([
+            {"$match": {"created_at": {"$gte": since}}},
+            {"$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                **_TOTALS
+            }},
+            {"$sort": {"_id": 1}}
+        ]))
+    for row in rows:
+        row["date"] = row.pop("_id")
+    return rows
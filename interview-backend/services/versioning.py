@@ -0,0 +1,127 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from config import get_settings
+from database import get_db
+
+# ---------------------------
+# VERSION STAMPS AND CONDITIONAL GET (ETag / Last-Modified / 304)
+# ---------------------------
+#
+# interview_sessions, interview_answers and companies carry version (an
+# integer bumped on every client-visible write) and updated_at. Answer
+# writes also bump their session, so a session's version covers the whole
+# GET /session and /export-pdf representation. Writes to server-only
+# fields (reference_answers, rollup) leave the version alone.
+
+
+def stamp(update: dict = None, now: datetime = None) -> dict:
+    """Add the version bump and updated_at to an update document."""
+    update = dict(update or {})
+    update["$inc"] = {**update.get("$inc", {}), "version": 1}
+    update["$set"] = {**update.get("$set", {}), "updated_at": now or datetime.utcnow()}
+    return update
+
+
+def new_version(created_at: datetime) -> dict:
+    """Version fields for a newly inserted document."""
+    return {"version": 1, "updated_at": created_at}
+
+
+def touch_session(db, session_id: str):
+    """Bump a session after a change to one of its answers."""
+    db.interview_sessions.update_one({"id": session_id}, stamp())
+    forget_session(session_id)
+
+
+def strong_etag(*parts) -> str:
+    return '"' + hashlib.sha1(":".join(str(p) for p in parts).encode("utf-8")).hexdigest() + '"'
+
+
+def http_date(value: datetime) -> str:
+    """RFC 7231 date for a naive-UTC timestamp."""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: datetime = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime = None) -> bool:
+    """
+    Whether the client's copy is current. If-None-Match wins over
+    If-Modified-Since when both are sent (RFC 7232).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: datetime = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+# Validators of completed sessions, so repeated polls are answered without a
+# database read. Entries expire after ETAG_CACHE_TTL_SECONDS, which bounds
+# how long a change made through another worker can go unnoticed.
+_validators = OrderedDict()  # session id -> (expires_at, user_id, version, updated_at)
+_validators_lock = threading.Lock()
+MAX_CACHED_VALIDATORS = 10000
+
+
+def session_validators(session_id: str, user_id: str):
+    """
+    (version, last_modified) of a user's session, or None if it does not
+    exist. Completed sessions are served from the in-process cache.
+    """
+    now = time.monotonic()
+    with _validators_lock:
+        entry = _validators.get(session_id)
+        if entry and entry[0] > now:
+            _validators.move_to_end(session_id)
+            return (entry[2], entry[3]) if entry[1] == user_id else None
+
+    with get_db() as db:
+        session = db.interview_sessions.find_one(
+            {"id": session_id, "user_id": user_id},
+            {"_id": 0, "version": 1, "updated_at": 1, "completed_at": 1, "created_at": 1, "status": 1}
+        )
+    if not session:
+        return None
+
+    version = session.get("version", 0)
+    last_modified = session.get("updated_at") or session.get("completed_at") or session.get("created_at")
+
+    ttl = get_settings().etag_cache_ttl_seconds
+    if session.get("status") == "completed" and ttl > 0:
+        with _validators_lock:
+            _validators[session_id] = (now + ttl, user_id, version, last_modified)
+            _validators.move_to_end(session_id)
+            while len(_validators) > MAX_CACHED_VALIDATORS:
+                _validators.popitem(last=False)
+    return version, last_modified
+
+
+def forget_session(session_id: str):
+    """Drop a session's cached validators after writing to it."""
+    with _validators_lock:
+        _validators.pop(session_id, None)
@@ -24,6 +24,8 @@ function InterviewScreen({ sessionData, onComplete }) {
   const questions = sessionData.questions || []
   const currentQuestion = questions[currentQuestionIndex]
   const totalQuestions = questions.length
+  // More questions may still be streaming in from the server
+  const waitingForQuestions = sessionData.generating && currentQuestionIndex >= questions.length - 1
 const token = localStorage.getItem('token') // ✅ JWT
 
   const authHeaders = {
@@ -197,6 +199,8 @@ const token = localStorage.getItem('token') // ✅ JWT
       setCurrentQuestionIndex(currentQuestionIndex + 1)
       setRecordingStopped(false)
       setSpeakingQuestion(false)
+    } else if (waitingForQuestions) {
+      return
     } else {
       analyzeInterview()
     }
@@ -340,11 +344,13 @@ const token = localStorage.getItem('token') // ✅ JWT
               <button
                 className="next-button"
                 onClick={handleNextQuestion}
-                disabled={uploading}
+                disabled={uploading || waitingForQuestions}
               >
-                {currentQuestionIndex < questions.length - 1
-                  ? 'Next Question'
-                  : 'Finish Interview'}
+                {waitingForQuestions
+                  ? 'Loading next question...'
+                  : currentQuestionIndex < questions.length - 1
+                    ? 'Next Question'
+                    : 'Finish Interview'}
               </button>
             </div>
           )}
@@ -6,17 +6,21 @@ function MyInterviews({ onOpenInterview, onStartNew }) {
   const [sessions, setSessions] = useState([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     fetchMyInterviews()
   }, [])
 
-  const fetchMyInterviews = async () => {
+  const fetchMyInterviews = async (cursor = null) => {
     try {
       const token = localStorage.getItem('token')
+      const params = new URLSearchParams({ limit: 20 })
+      if (cursor) params.set('cursor', cursor)
 
       const response = await fetch(
-        'http://localhost:8000/api/my-sessions',
+        `http://localhost:8000/api/my-sessions?${params}`,
         {
           headers: {
             Authorization: `Bearer ${token}`
@@ -29,14 +33,21 @@ function MyInterviews({ onOpenInterview, onStartNew }) {
       }
 
       const data = await response.json()
-      setSessions(data.sessions || [])
+      setSessions((prev) => (cursor ? [...prev, ...(data.sessions || [])] : data.sessions || []))
+      setNextCursor(data.next_cursor || null)
     } catch (err) {
       setError(err.message || 'Something went wrong')
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
+  const loadMore = () => {
+    setLoadingMore(true)
+    fetchMyInterviews(nextCursor)
+  }
+
   const getStatusColor = (status) => {
     if (status === 'completed') return '#48bb78'
     if (status === 'created') return '#ecc94b'
@@ -128,6 +139,14 @@ function MyInterviews({ onOpenInterview, onStartNew }) {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="load-more">
+            <button onClick={loadMore} className="secondary-btn" disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   )
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react'
 import './SetupScreen.css'
 
-function SetupScreen({ onSessionCreated }) {
+function SetupScreen({ onSessionCreated, onQuestionReceived, onQuestionsComplete }) {
   const [interviewMode, setInterviewMode] = useState('general') // 'general' or 'company'
   const [jobDescription, setJobDescription] = useState('')
   const [resume, setResume] = useState(null)
@@ -54,6 +54,67 @@ function SetupScreen({ onSessionCreated }) {
     }
   }
 
+  // Create a general session over SSE: "session", then "question" events, then "done" or "error"
+  const streamSession = async (formData, token) => {
+    const response = await fetch(
+      'http://localhost:8000/api/create-session/stream',
+      {
+        method: 'POST',
+        headers: {
+          Authorization: `Bearer ${token}`
+        },
+        body: formData
+      }
+    )
+
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}))
+      throw new Error(errorData.detail || 'Failed to create interview session')
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    let session = null
+    let started = false
+
+    try {
+      while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+
+        let boundary
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const frame = buffer.slice(0, boundary)
+          buffer = buffer.slice(boundary + 2)
+
+          const event = frame.match(/^event: (.*)$/m)?.[1]
+          const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || '{}')
+
+          if (event === 'session') {
+            session = data
+          } else if (event === 'question') {
+            if (!started) {
+              started = true
+              onSessionCreated({ ...session, questions: [data], generating: true })
+            } else {
+              onQuestionReceived?.(data)
+            }
+          } else if (event === 'error' && !started) {
+            throw new Error(data.detail || 'Failed to generate interview questions')
+          }
+        }
+      }
+    } finally {
+      if (started) onQuestionsComplete?.()
+    }
+
+    if (!started) {
+      throw new Error('Failed to generate interview questions')
+    }
+  }
+
   const handleSubmit = async (e) => {
     e.preventDefault()
 
@@ -96,6 +157,12 @@ function SetupScreen({ onSessionCreated }) {
 
       const token = localStorage.getItem('token') // ✅ AUTH TOKEN
 
+      if (interviewMode === 'general') {
+        // Questions stream in one by one; the interview starts on the first
+        await streamSession(formData, token)
+        return
+      }
+
       const response = await fetch(
         'http://localhost:8000/api/create-session',
         {
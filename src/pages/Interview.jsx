@@ -14,6 +14,15 @@ function InterviewComponent() {
     setScreen('interview')
   }
 
+  // Streamed sessions keep receiving questions after the interview has started
+  const handleQuestionReceived = (question) => {
+    setSessionData(prev => prev ? { ...prev, questions: [...prev.questions, question] } : prev)
+  }
+
+  const handleQuestionsComplete = () => {
+    setSessionData(prev => prev ? { ...prev, generating: false } : prev)
+  }
+
   const handleInterviewComplete = () => {
     setScreen('results')
   }
@@ -26,7 +35,11 @@ function InterviewComponent() {
   return (
     <div className="app">
       {screen === 'setup' && (
-        <SetupScreen onSessionCreated={handleSessionCreated} />
+        <SetupScreen
+          onSessionCreated={handleSessionCreated}
+          onQuestionReceived={handleQuestionReceived}
+          onQuestionsComplete={handleQuestionsComplete}
+        />
       )}
 
       {screen === 'interview' && sessionData && (
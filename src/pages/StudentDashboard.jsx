@@ -40,7 +40,7 @@ const StudentDashboard = () => {
         api.get('/assessments'),
         api.get('/attempts/my-attempts'),
         api.get('/folders'),
-        aiApi.get('/my-sessions')
+        aiApi.get('/my-sessions', { params: { limit: 10 } })
       ]);
 
       // ---------- Existing Data ----------
@@ -63,25 +63,13 @@ const StudentDashboard = () => {
       });
 
       // ---------- AI Interview Data ----------
-      const myInterviews = interviewsRes.data.sessions || [];
-      setInterviews(myInterviews);
-
-      const completedInterviews = myInterviews.filter(
-        i => i.status === 'completed'
-      );
-
-      const avgInterviewScore =
-        completedInterviews.length > 0
-          ? completedInterviews.reduce(
-              (s, i) => s + (i.final_score || 0),
-              0
-            ) / completedInterviews.length
-          : 0;
+      setInterviews(interviewsRes.data.sessions || []);
 
+      const summaryRes = await aiApi.get('/my-sessions/summary');
       setInterviewStats({
-        total: myInterviews.length,
-        completed: completedInterviews.length,
-        avgScore: avgInterviewScore.toFixed(1)
+        total: summaryRes.data.total,
+        completed: summaryRes.data.completed,
+        avgScore: (summaryRes.data.avg_score || 0).toFixed(1)
       });
     } catch (error) {
       console.error('Error fetching dashboard data:', error);